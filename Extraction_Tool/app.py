@@ -1,14 +1,12 @@
 import streamlit as st
-import requests
-import pandas as pd
-import time
-import re
-from bs4 import BeautifulSoup
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
 import tempfile
+import time
 import os
 
+from extract import SOURCE_LABELS
+from jobs import job_result, job_status, list_jobs, submit_extraction
+from leagues import DEFAULT_LEAGUES, LEAGUES
+
 # ================= PAGE CONFIG =================
 st.set_page_config(
     page_title="NCAA Fixture Extraction Tool",
@@ -18,185 +16,8 @@ st.set_page_config(
 st.title("🏀 NCAA Fixture Extraction Tool")
 st.caption("Berlin (CET/CEST) & GMT time zones | ESPN Schedule Extraction")
 
-# ================= TIME ZONES =================
-ET_TZ = ZoneInfo("America/New_York")
-BERLIN_TZ = ZoneInfo("Europe/Berlin")
-GMT_TZ = ZoneInfo("UTC")
-
-# ================= HEADERS =================
-HEADERS = {
-    "User-Agent": "Mozilla/5.0"
-}
-
-# ================= SPORT SLUG =================
-SPORT_SLUG = {
-    "Men": "mens-college-basketball",
-    "Women": "womens-college-basketball"
-}
-
-# ================= TEAM NAME CLEAN =================
-def clean_team_name(name: str) -> str:
-    name = re.sub(r'@', '', name)
-    name = re.sub(r'^\s*\d+\s*[-–]?\s*', '', name)
-    return name.strip()
-
-# ================= TIME CONVERSION =================
-def convert_et_to_timezones(et_date, time_str):
-    txt = time_str.lower()
-    if any(x in txt for x in ["final", "tbd", "post", "ppd"]):
-        return None, None
-
-    try:
-        dt_et = datetime.strptime(
-            f"{et_date} {time_str}",
-            "%Y%m%d %I:%M %p"
-        ).replace(tzinfo=ET_TZ)
-
-        return (
-            dt_et.astimezone(BERLIN_TZ),
-            dt_et.astimezone(GMT_TZ)
-        )
-    except Exception:
-        return None, None
-
-# ================= VENUE FETCH =================
-def fetch_venue(game_url):
-    if not game_url:
-        return "", ""
-
-    try:
-        m = re.search(r'gameId/(\d+)', game_url)
-        if not m:
-            return "", ""
-
-        event_id = m.group(1)
-        api_url = (
-            "https://site.web.api.espn.com/apis/site/v2/sports/"
-            "basketball/mens-college-basketball/summary"
-            f"?event={event_id}"
-        )
-
-        r = requests.get(api_url, headers=HEADERS, timeout=30)
-        data = r.json()
-
-        venue = data.get("gameInfo", {}).get("venue", {})
-        address = venue.get("address", {})
-
-        return venue.get("fullName", ""), address.get("city", "")
-    except Exception:
-        return "", ""
-
-# ================= FETCH ESPN =================
-def fetch_espn_schedule_by_et_date(et_date, sport_slug):
-    url = f"https://www.espn.com/{sport_slug}/schedule/_/date/{et_date}"
-    r = requests.get(url, headers=HEADERS, timeout=30)
-    soup = BeautifulSoup(r.text, "html.parser")
-
-    rows = soup.select("table tbody tr")
-    fixtures = []
-
-    for row in rows:
-        cols = row.find_all("td")
-        if len(cols) < 3:
-            continue
-
-        away = clean_team_name(cols[0].get_text(strip=True))
-        home = clean_team_name(cols[1].get_text(strip=True))
-        time_status = cols[2].get_text(strip=True)
-
-        game_url = ""
-        for a in row.find_all("a", href=True):
-            if "gameId" in a["href"]:
-                game_url = (
-                    "https://www.espn.com" + a["href"]
-                    if a["href"].startswith("/")
-                    else a["href"]
-                )
-                break
-
-        berlin_dt, gmt_dt = convert_et_to_timezones(et_date, time_status)
-        venue, city = fetch_venue(game_url)
-
-        fixtures.append({
-            "Away Team": away,
-            "Home Team": home,
-            "Berlin DateTime": berlin_dt,
-            "GMT DateTime": gmt_dt,
-            "Venue": venue,
-            "City": city,
-            "Game URL": game_url
-        })
-
-        time.sleep(0.2)
-
-    return pd.DataFrame(fixtures)
-
-# ================= RANGE EXTRACTION =================
-def extract_fixtures_by_berlin_range(start_date, end_date, sport):
-    sport_slug = SPORT_SLUG[sport]
-
-    berlin_start = datetime.strptime(
-        start_date, "%Y-%m-%d"
-    ).replace(tzinfo=BERLIN_TZ)
-
-    berlin_end = datetime.strptime(
-        end_date, "%Y-%m-%d"
-    ).replace(tzinfo=BERLIN_TZ)
-
-    all_results = []
-    current_day = berlin_start
-
-    while current_day <= berlin_end:
-        berlin_day_start = current_day
-        berlin_day_end = current_day + timedelta(days=1)
-
-        et_dates = {
-            berlin_day_start.astimezone(ET_TZ).strftime("%Y%m%d"),
-            berlin_day_end.astimezone(ET_TZ).strftime("%Y%m%d")
-        }
-
-        day_data = []
-
-        for et_date in sorted(et_dates):
-            df = fetch_espn_schedule_by_et_date(et_date, sport_slug)
-            if not df.empty:
-                day_data.append(df)
-
-        if day_data:
-            df_all = pd.concat(day_data, ignore_index=True)
-
-            df_filtered = df_all[
-                df_all["Berlin DateTime"].notna() &
-                (df_all["Berlin DateTime"].dt.date == berlin_day_start.date())
-            ].copy()
-
-            all_results.append(df_filtered)
-
-        current_day += timedelta(days=1)
-
-    if not all_results:
-        return pd.DataFrame()
-
-    df_final = pd.concat(all_results, ignore_index=True)
-
-    # ================= FINAL FORMAT =================
-    df_final["Start Date"] = df_final["GMT DateTime"].dt.strftime("%m/%d/%Y")
-    df_final["Start Time"] = df_final["GMT DateTime"].dt.strftime("%I:%M:%S %p")
-
-    df_final["Description"] = (
-        df_final["Home Team"] + " v " + df_final["Away Team"]
-    )
-
-    df_final["Date & Time (Berlin)"] = (
-        df_final["Berlin DateTime"].dt.strftime("%Y-%m-%d %H:%M %Z")
-    )
-
-    df_final.drop(
-        columns=["Berlin DateTime", "GMT DateTime"],
-        inplace=True
-    )
-
-    return df_final
+PROGRESS_POLL_SECONDS = 1
+JOBS_SHOWN = 10
 
 # ================= UI =================
 col1, col2, col3 = st.columns(3)
@@ -208,39 +29,114 @@ with col2:
     end_date = st.date_input("End Date (Berlin)")
 
 with col3:
-    sport = st.selectbox("Select Sport", ["Men", "Women"])
+    leagues = st.multiselect(
+        "Leagues",
+        list(LEAGUES),
+        default=DEFAULT_LEAGUES,
+        format_func=lambda key: LEAGUES[key].label
+    )
+
+source = st.radio(
+    "Source",
+    list(SOURCE_LABELS),
+    format_func=SOURCE_LABELS.get,
+    horizontal=True
+)
+
+incremental = st.checkbox(
+    "Incremental sync (reuse stored schedule pages that can no longer change)",
+    value=True
+)
 
 # ================= RUN =================
+# Extractions run as background jobs (jobs.py). The job id is kept in the
+# URL, so a reconnecting or reloaded session picks the same job up again.
+job_id = st.query_params.get("job")
+
 if st.button("Extract Fixtures"):
     if start_date > end_date:
         st.error("Start date must be before or equal to end date.")
+    elif not leagues:
+        st.error("Select at least one league.")
     else:
-        with st.spinner("Extracting fixtures from ESPN..."):
-            df = extract_fixtures_by_berlin_range(
-                start_date.strftime("%Y-%m-%d"),
-                end_date.strftime("%Y-%m-%d"),
-                sport
-            )
+        job_id = submit_extraction(
+            start_date.strftime("%Y-%m-%d"),
+            end_date.strftime("%Y-%m-%d"),
+            leagues,
+            incremental,
+            source
+        )
+        st.query_params["job"] = job_id
+
+state = job_status(job_id) if job_id else None
 
-        if df.empty:
-            st.warning("No fixtures found for the selected date range.")
-        else:
-            st.success(f"Fixtures extracted: {len(df)}")
+if state and state["status"] in ("queued", "running"):
+    total = state["total"] or 0
+    st.progress(
+        state["done"] / total if total else 0.0,
+        text=f"Extracting fixtures from ESPN... {state['done']}/{total} league-date pages"
+    )
+    time.sleep(PROGRESS_POLL_SECONDS)
+    st.rerun()
 
-            st.subheader("Fixture Preview")
-            st.dataframe(df, use_container_width=True)
+elif state and state["status"] in ("failed", "interrupted"):
+    message = state["error"] or "The extraction was interrupted."
+    st.error(f"{message} ({state['done']}/{state['total']} pages checkpointed)")
+    if st.button("Resume extraction"):
+        submit_extraction(**state["params"])
+        st.rerun()
 
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-                output_path = tmp.name
+elif state and state["status"] == "done":
+    df = job_result(job_id)
 
-            df.to_excel(output_path, index=False)
+    with st.expander("Request metrics"):
+        # Recorded by the job itself; other sessions' requests are not included
+        st.dataframe(state.get("metrics") or [], use_container_width=True)
 
-            with open(output_path, "rb") as f:
-                st.download_button(
-                    "Download Excel",
-                    f,
-                    file_name="NCAA_Fixtures_Final.xlsx",
-                    mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-                )
+    if df is None or df.empty:
+        st.warning("No fixtures found for the selected date range.")
+    else:
+        st.success(f"Fixtures extracted: {len(df)}")
+
+        # This job's own counters; the caches themselves are shared by every job
+        counters = state.get("counters") or {}
+        m1, m2, m3, m4, m5 = st.columns(5)
+        m1.metric("Venue cache hits", counters.get("venue_hits", 0))
+        m2.metric("Venue cache misses", counters.get("venue_misses", 0))
+        m3.metric("Expired entries", counters.get("venue_expired", 0))
+        m4.metric("Schedule pages fetched", counters.get("schedule_fetched", 0))
+        m5.metric("Schedule pages reused", counters.get("schedule_reused", 0))
+
+        st.subheader("Fixture Preview")
+        st.dataframe(df, use_container_width=True)
+
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
+            output_path = tmp.name
+
+        df.to_excel(output_path, index=False)
+
+        with open(output_path, "rb") as f:
+            st.download_button(
+                "Download Excel",
+                f,
+                file_name="NCAA_Fixtures_Final.xlsx",
+                mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+            )
 
-            os.remove(output_path)
+        os.remove(output_path)
+
+# ================= JOBS =================
+with st.expander("Extraction jobs"):
+    jobs = list_jobs()
+    if not jobs:
+        st.caption("No extraction jobs yet.")
+    for listed_id, listed in jobs[:JOBS_SHOWN]:
+        params = listed["params"]
+        st.write(
+            f"`{listed_id}` {', '.join(params.get('leagues', []))} {params['start_date']} to "
+            f"{params['end_date']} ({params['source']}): **{listed['status']}**, "
+            f"{listed['done']}/{listed['total']} pages"
+        )
+        if listed_id != job_id and st.button("Open", key=f"open-{listed_id}"):
+            st.query_params["job"] = listed_id
+            st.rerun()
@@ -0,0 +1,322 @@
+"""
+ESPN fixture extraction engine, usable without Streamlit.
+
+Fetches schedules for a Berlin (CET/CEST) date range and returns one row
+per fixture with GMT start date/time, Berlin date/time and venue.
+"""
+import os
+import re
+import sys
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import numpy as np
+import pandas as pd
+import requests
+
+from fetch import http_get, map_concurrent
+from leagues import get_league
+from parsing import parse_schedule
+from schedule_store import SCHEDULE_STORE
+from venue_cache import VENUE_CACHE
+
+# team_names.py lives at the repository root, shared with File_Comparison_tool
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from team_names import canonical_team_name, load_alias_table
+
+# ================= TIME ZONES =================
+ET_TZ = ZoneInfo("America/New_York")
+BERLIN_TZ = ZoneInfo("Europe/Berlin")
+GMT_TZ = ZoneInfo("UTC")
+
+# ================= HEADERS =================
+HEADERS = {
+    "User-Agent": "Mozilla/5.0"
+}
+
+# ================= TEAM NAME CLEAN =================
+def clean_team_name(name: str) -> str:
+    name = re.sub(r'@', '', name)
+    name = re.sub(r'^\s*\d+\s*[-–]?\s*', '', name)
+    return name.strip()
+
+# ================= TIME CONVERSION =================
+# Status words shown instead of a start time; anything else that is not a
+# "7:00 PM" style time (live scores, blanks) is masked as well
+STATUS_WORDS = r"final|tbd|post|ppd|canceled|cancelled|susp"
+TIME_PATTERN = r"\d{1,2}:\d{2}\s+[AaPp][Mm]"
+
+def convert_et_to_timezones(et_dates, time_strs):
+    """
+    Vectorized ET date + start time -> (Berlin, GMT) datetime Series.
+
+    Status rows come back as NaT. DST transitions are resolved explicitly:
+    an ambiguous fall-back time is read as the first (EDT) occurrence and a
+    spring-forward time that does not exist moves forward one hour.
+    """
+    et_dates = pd.Series(et_dates, dtype="string").reset_index(drop=True)
+    times = pd.Series(time_strs, dtype="string").reset_index(drop=True).str.strip()
+
+    is_time = times.str.fullmatch(TIME_PATTERN, case=False) & ~times.str.contains(STATUS_WORDS, case=False)
+    naive = pd.to_datetime(
+        et_dates + " " + times.where(is_time.fillna(False).astype(bool)),
+        format="%Y%m%d %I:%M %p",
+        errors="coerce"
+    )
+
+    dt_et = naive.dt.tz_localize(
+        ET_TZ,
+        ambiguous=np.ones(len(naive), dtype=bool),
+        nonexistent=pd.Timedelta(hours=1)
+    )
+    return dt_et.dt.tz_convert(BERLIN_TZ), dt_et.dt.tz_convert(GMT_TZ)
+
+# ================= VENUE FETCH =================
+def fetch_venue(game_url, league):
+    if not game_url:
+        return "", ""
+
+    m = re.search(r'gameId/(\d+)', game_url)
+    if not m:
+        return "", ""
+
+    event_id = m.group(1)
+    cached = VENUE_CACHE.get(event_id)
+    if cached is not None:
+        return cached
+
+    try:
+        # The venue cache keeps what is needed from the summary
+        r = http_get(league.summary_url(event_id), headers=HEADERS, timeout=30, revalidate=False)
+        data = r.json()
+
+        venue = data.get("gameInfo", {}).get("venue", {})
+        address = venue.get("address", {})
+        result = venue.get("fullName", ""), address.get("city", "")
+    except (requests.RequestException, ValueError):
+        # Already retried in http_get and counted in the request metrics
+        return "", ""
+
+    # Venues not announced yet are looked up again next time
+    if result[0]:
+        VENUE_CACHE.put(event_id, *result)
+    return result
+
+# ================= FETCH ESPN =================
+PAGE_COLUMNS = ["Away Team", "Home Team", "Berlin DateTime", "GMT DateTime", "Venue", "City", "Game URL"]
+
+def fetch_espn_schedule_by_et_date(et_date, league):
+    r = http_get(league.schedule_url(et_date), headers=HEADERS, timeout=30)
+
+    aliases = load_alias_table()
+    fixtures = []
+
+    for row in parse_schedule(r.text):
+        href = row["game_href"]
+
+        fixtures.append({
+            "Away Team": canonical_team_name(clean_team_name(row["away"]), aliases),
+            "Home Team": canonical_team_name(clean_team_name(row["home"]), aliases),
+            "Time Status": row["time_status"],
+            "Game URL": "https://www.espn.com" + href if href.startswith("/") else href
+        })
+
+    if not fixtures:
+        return pd.DataFrame(columns=PAGE_COLUMNS)
+
+    page = pd.DataFrame(fixtures)
+    page["Berlin DateTime"], page["GMT DateTime"] = convert_et_to_timezones(
+        [et_date] * len(page), page["Time Status"]
+    )
+
+    # Venue lookups for the whole page run concurrently under the shared
+    # rate limiter (fetch.py)
+    venues = map_concurrent(lambda game_url: fetch_venue(game_url, league), page["Game URL"])
+    page["Venue"] = [venue for venue, _ in venues]
+    page["City"] = [city for _, city in venues]
+
+    return page[PAGE_COLUMNS]
+
+# ================= FETCH ESPN SCOREBOARD =================
+# One scoreboard response per date carries teams, UTC start time and venue
+# for every game, so this source needs no per-game summary calls.
+
+# Statuses the schedule page shows instead of a start time
+SKIP_STATUSES = {"STATUS_FINAL", "STATUS_POSTPONED", "STATUS_CANCELED", "STATUS_SUSPENDED"}
+
+def parse_scoreboard(data, league, aliases=None):
+    fixtures = []
+
+    for event in data.get("events", []):
+        competition = (event.get("competitions") or [{}])[0]
+        status = (event.get("status") or competition.get("status") or {}).get("type", {})
+
+        # Same rows as the schedule page keeps: scheduled games with a time
+        if status.get("state") != "pre" or status.get("name") in SKIP_STATUSES:
+            continue
+        if competition.get("timeValid") is False or not event.get("date"):
+            continue
+
+        teams = {}
+        for competitor in competition.get("competitors", []):
+            team = competitor.get("team", {})
+            name = team.get(league.name_field) or team.get("displayName") or team.get("location", "")
+            teams[competitor.get("homeAway")] = canonical_team_name(clean_team_name(name), aliases)
+
+        venue = competition.get("venue", {})
+        event_id = str(event.get("id", ""))
+
+        fixtures.append({
+            "Away Team": teams.get("away", ""),
+            "Home Team": teams.get("home", ""),
+            "Start UTC": event["date"],
+            "Venue": venue.get("fullName", ""),
+            "City": venue.get("address", {}).get("city", ""),
+            "Game URL": league.game_url(event_id) if event_id else "",
+        })
+
+        # Lets the schedule source skip the summary call for this game too
+        if event_id and venue.get("fullName"):
+            VENUE_CACHE.put(event_id, venue["fullName"], venue.get("address", {}).get("city", ""))
+
+    if not fixtures:
+        return pd.DataFrame(columns=PAGE_COLUMNS)
+
+    page = pd.DataFrame(fixtures)
+    page["GMT DateTime"] = pd.to_datetime(page["Start UTC"], utc=True, errors="coerce").dt.tz_convert(GMT_TZ)
+    page["Berlin DateTime"] = page["GMT DateTime"].dt.tz_convert(BERLIN_TZ)
+    return page[PAGE_COLUMNS]
+
+def fetch_espn_scoreboard_by_et_date(et_date, league):
+    r = http_get(league.scoreboard_url(et_date), headers=HEADERS, timeout=30)
+    return parse_scoreboard(r.json(), league, load_alias_table())
+
+# ================= SOURCES =================
+SOURCES = {
+    "schedule": fetch_espn_schedule_by_et_date,
+    "scoreboard": fetch_espn_scoreboard_by_et_date,
+}
+
+SOURCE_LABELS = {
+    "schedule": "ESPN schedule pages + venue lookups",
+    "scoreboard": "ESPN scoreboard API (1 request per date)",
+}
+
+# ================= RANGE EXTRACTION =================
+# Pages fetched at once, across all leagues; venue lookups inside each page
+# are concurrent too, and every request goes through the shared rate and
+# concurrency limits in fetch.py
+PAGE_WORKERS = 4
+
+def et_dates_for_berlin_range(berlin_start, berlin_end):
+    """Every ET schedule date touched by the Berlin days in the range, once."""
+    et_dates = set()
+    current_day = berlin_start
+
+    while current_day <= berlin_end:
+        et_dates.add(current_day.astimezone(ET_TZ).strftime("%Y%m%d"))
+        et_dates.add((current_day + timedelta(days=1)).astimezone(ET_TZ).strftime("%Y%m%d"))
+        current_day += timedelta(days=1)
+
+    return sorted(et_dates)
+
+def berlin_range(start_date, end_date):
+    berlin_start = datetime.strptime(
+        start_date, "%Y-%m-%d"
+    ).replace(tzinfo=BERLIN_TZ)
+
+    berlin_end = datetime.strptime(
+        end_date, "%Y-%m-%d"
+    ).replace(tzinfo=BERLIN_TZ)
+
+    return berlin_start, berlin_end
+
+def page_fetcher(league_key, incremental=False, source="schedule"):
+    """et_date -> parsed page for one league and source, through the schedule store."""
+    league = get_league(league_key)
+    if not league.schedule_pages:
+        source = "scoreboard"
+    fetch_page = SOURCES[source]
+    store_key = league.slug if source == "schedule" else f"{league.slug}-{source}"
+
+    # Every fetched page is stored; incremental runs reuse stored pages
+    # that can no longer change
+    def fetch(et_date):
+        page = SCHEDULE_STORE.page(
+            store_key, et_date, lambda d: fetch_page(d, league), refresh=not incremental
+        )
+        return page.assign(League=league.label)
+
+    return fetch
+
+def extraction_tasks(start_date, end_date, leagues):
+    """(league_key, et_date) pairs for a Berlin range, league by league."""
+    berlin_start, berlin_end = berlin_range(start_date, end_date)
+    et_dates = et_dates_for_berlin_range(berlin_start, berlin_end)
+    return [(league_key, et_date) for league_key in leagues for et_date in et_dates]
+
+def extract_fixtures_by_berlin_range(start_date, end_date, leagues, incremental=False, source="schedule"):
+    """
+    Fixtures on the Berlin days start_date..end_date for the given league
+    keys (leagues.LEAGUES), all leagues and dates fetched in one pool.
+    """
+    berlin_start, berlin_end = berlin_range(start_date, end_date)
+    fetchers = {league_key: page_fetcher(league_key, incremental, source) for league_key in leagues}
+
+    # Neighbouring Berlin days share ET dates, so each page is fetched once
+    # and fixtures are assigned to Berlin days afterwards
+    pages = map_concurrent(
+        lambda task: fetchers[task[0]](task[1]),
+        extraction_tasks(start_date, end_date, leagues),
+        max_workers=PAGE_WORKERS
+    )
+    return assemble_fixtures(pages, berlin_start, berlin_end)
+
+def assemble_fixtures(pages, berlin_start, berlin_end):
+    """Fixtures from the fetched pages that fall on the Berlin days, formatted."""
+    pages = [df for df in pages if not df.empty]
+
+    if not pages:
+        return pd.DataFrame()
+
+    df_all = pd.concat(pages, ignore_index=True)
+    berlin_dt = pd.to_datetime(df_all["Berlin DateTime"], utc=True).dt.tz_convert(BERLIN_TZ)
+    berlin_day = berlin_dt.dt.tz_localize(None).dt.normalize()
+
+    in_range = berlin_day.between(
+        pd.Timestamp(berlin_start.date()), pd.Timestamp(berlin_end.date())
+    )
+    df_final = df_all[in_range].assign(**{
+        "Berlin DateTime": berlin_dt[in_range],
+        "GMT DateTime": pd.to_datetime(df_all["GMT DateTime"][in_range], utc=True),
+        "Berlin Day": berlin_day[in_range],
+    })
+
+    # Same order as a day-by-day crawl: Berlin day, then league, ET page, row
+    df_final = df_final.sort_values("Berlin Day", kind="stable").drop(columns="Berlin Day")
+    df_final = df_final.reset_index(drop=True)
+
+    if df_final.empty:
+        return pd.DataFrame()
+
+    # ================= FINAL FORMAT =================
+    df_final["Start Date"] = df_final["GMT DateTime"].dt.strftime("%m/%d/%Y")
+    df_final["Start Time"] = df_final["GMT DateTime"].dt.strftime("%I:%M:%S %p")
+
+    df_final["Description"] = (
+        df_final["Home Team"] + " v " + df_final["Away Team"]
+    )
+
+    df_final["Date & Time (Berlin)"] = (
+        df_final["Berlin DateTime"].dt.strftime("%Y-%m-%d %H:%M %Z")
+    )
+
+    df_final.drop(
+        columns=["Berlin DateTime", "GMT DateTime"],
+        inplace=True
+    )
+
+    return df_final[["League"] + [c for c in df_final.columns if c != "League"]]
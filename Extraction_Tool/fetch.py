@@ -0,0 +1,301 @@
+"""
+Rate-limited concurrent fetching for the ESPN scraper.
+
+Every request goes through one process-wide token bucket and a cap on
+requests in flight, so concurrent lookups, leagues, jobs and Streamlit
+sessions all share the same request budget instead of each sleeping a
+fixed amount per row.
+
+http_get() also reuses pooled keep-alive connections, retries transient
+failures with jittered exponential backoff, revalidates cached responses
+with ETag / If-Modified-Since, and records latency and status for every
+request (request_metrics()), both process-wide and for the job that made it.
+"""
+import contextvars
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+
+import pandas as pd
+import requests
+from requests.adapters import HTTPAdapter
+
+# Same average pace as the old 0.2s sleep per row, but bursts are allowed
+REQUESTS_PER_SECOND = 5
+BURST = 5
+MAX_WORKERS = 8
+MAX_IN_FLIGHT = 16
+
+POOL_SIZE = 32
+RETRIES = 3
+BACKOFF_SECONDS = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+RESPONSE_CACHE_DIR = os.environ.get(
+    "RESPONSE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".extraction_cache", "http")
+)
+RESPONSE_CACHE_ENTRIES = 2000
+REQUEST_LOG_SIZE = 20000
+
+# ================= RATE LIMITER =================
+class TokenBucket:
+    """Thread-safe token bucket; acquire() blocks until a token is free."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # Take the token now and sleep off the debt outside the lock,
+            # so waiting callers are served in arrival order
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+
+        if wait:
+            time.sleep(wait)
+
+RATE_LIMITER = TokenBucket(REQUESTS_PER_SECOND, BURST)
+IN_FLIGHT = threading.BoundedSemaphore(MAX_IN_FLIGHT)
+
+# ================= SESSION =================
+def _make_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_SIZE)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+SESSION = _make_session()
+
+# ================= RESPONSE CACHE =================
+# Schedule and scoreboard responses carrying an ETag or Last-Modified are
+# kept on disk and sent back as validators; a 304 reply is served from the
+# stored body. Game summaries are not kept: the venue cache already holds
+# the one field read from them. At most RESPONSE_CACHE_ENTRIES responses
+# are kept, least recently used dropped first.
+def _cache_paths(url):
+    key = hashlib.sha256(url.encode("utf-8")).hexdigest()
+    base = os.path.join(RESPONSE_CACHE_DIR, key)
+    return base + ".json", base + ".body"
+
+def _cached_response(url):
+    meta_path, body_path = _cache_paths(url)
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        with open(body_path, "rb") as f:
+            body = f.read()
+    except (OSError, ValueError):
+        return None, None
+    return meta, body
+
+def _store_response(url, response):
+    validators = {
+        "etag": response.headers.get("ETag"),
+        "last_modified": response.headers.get("Last-Modified"),
+    }
+    if not any(validators.values()):
+        return
+
+    meta_path, body_path = _cache_paths(url)
+    os.makedirs(RESPONSE_CACHE_DIR, exist_ok=True)
+    tmp = f"{body_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(response.content)
+    os.replace(tmp, body_path)
+
+    meta = {**validators, "encoding": response.encoding,
+            "content_type": response.headers.get("Content-Type")}
+    tmp = f"{meta_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    os.replace(tmp, meta_path)
+    _prune_responses()
+
+def _prune_responses(keep=RESPONSE_CACHE_ENTRIES):
+    try:
+        metas = [entry for entry in os.scandir(RESPONSE_CACHE_DIR) if entry.name.endswith(".json")]
+    except OSError:
+        return
+    if len(metas) <= keep:
+        return
+
+    def last_used(entry):
+        try:
+            return entry.stat().st_mtime
+        except OSError:
+            return 0
+
+    metas.sort(key=last_used)
+    for entry in metas[:-keep]:
+        for path in (entry.path, entry.path[:-len(".json")] + ".body"):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def _from_cache(url, meta, body):
+    # Marks the entry as recently used for _prune_responses()
+    try:
+        os.utime(_cache_paths(url)[0])
+    except OSError:
+        pass
+    response = requests.Response()
+    response.status_code = 200
+    response.url = url
+    response._content = body
+    response.encoding = meta.get("encoding")
+    if meta.get("content_type"):
+        response.headers["Content-Type"] = meta["content_type"]
+    return response
+
+# ================= METRICS =================
+# Newest REQUEST_LOG_SIZE requests; the server process may run for weeks
+REQUEST_LOG = deque(maxlen=REQUEST_LOG_SIZE)
+_log_lock = threading.Lock()
+
+def _record(url, status, started, attempts, revalidated):
+    # Dates and event ids are masked so requests group by endpoint
+    endpoint = urlsplit(url)
+    endpoint = endpoint.netloc + re.sub(r"/\d{6,}", "/*", endpoint.path)
+    entry = {
+        "Endpoint": endpoint,
+        "Status": status,
+        "Latency (s)": time.perf_counter() - started,
+        "Attempts": attempts,
+        "Revalidated": revalidated,
+    }
+    records = _job_records.get()
+    with _log_lock:
+        REQUEST_LOG.append(entry)
+        if records is not None and records[1] is not None:
+            records[1].append(entry)
+
+def reset_metrics():
+    with _log_lock:
+        REQUEST_LOG.clear()
+
+def request_metrics(requests=None):
+    """Per-endpoint request count, latency and status summary of requests (default: REQUEST_LOG)."""
+    with _log_lock:
+        log = pd.DataFrame(list(REQUEST_LOG if requests is None else requests))
+    if log.empty:
+        return log
+
+    grouped = log.groupby("Endpoint")
+    return pd.DataFrame({
+        "Requests": grouped.size(),
+        "Mean latency (s)": grouped["Latency (s)"].mean().round(3),
+        "p95 latency (s)": grouped["Latency (s)"].quantile(0.95).round(3),
+        "Total time (s)": grouped["Latency (s)"].sum().round(2),
+        "Retries": grouped["Attempts"].sum() - grouped.size(),
+        "304 revalidated": grouped["Revalidated"].sum(),
+        "Statuses": grouped["Status"].agg(
+            lambda statuses: ", ".join(f"{k}: {n}" for k, n in statuses.value_counts().items())
+        ),
+    }).reset_index()
+
+# ================= HTTP GET =================
+def _backoff(attempt, response=None):
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after and retry_after.isdigit():
+        return float(retry_after)
+    return BACKOFF_SECONDS * 2 ** attempt * random.uniform(0.5, 1.5)
+
+def http_get(url, headers=None, timeout=30, revalidate=True):
+    """
+    Rate-limited GET with retries and conditional revalidation.
+    revalidate=False skips the response cache for this URL.
+
+    Raises requests.RequestException once the retries are used up, so
+    callers decide how a failed lookup is reported.
+    """
+    meta, body = _cached_response(url) if revalidate else (None, None)
+    headers = dict(headers or {})
+    if meta:
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+
+    started = time.perf_counter()
+    for attempt in range(RETRIES + 1):
+        RATE_LIMITER.acquire()
+        try:
+            with IN_FLIGHT:
+                response = SESSION.get(url, headers=headers, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt == RETRIES:
+                _record(url, type(e).__name__, started, attempt + 1, False)
+                raise
+            time.sleep(_backoff(attempt))
+            continue
+
+        if response.status_code in RETRY_STATUSES and attempt < RETRIES:
+            time.sleep(_backoff(attempt, response))
+            continue
+        break
+
+    _record(url, response.status_code, started, attempt + 1, response.status_code == 304)
+
+    if response.status_code == 304 and meta:
+        return _from_cache(url, meta, body)
+
+    response.raise_for_status()
+    if revalidate:
+        _store_response(url, response)
+    return response
+
+# ================= JOB COUNTERS =================
+# The venue cache, schedule store and request log are shared by every job
+# in the process; each also records into the counters and request list of
+# the job the calling thread works for, so concurrent jobs report their
+# own numbers
+_job_records = contextvars.ContextVar("job_records", default=None)
+_counter_lock = threading.Lock()
+
+@contextmanager
+def counting_for_job(counters, requests=None):
+    """
+    Add count_for_job() calls made in this block (and its map_concurrent
+    pools) to counters, and its http_get() requests to requests.
+    """
+    token = _job_records.set((counters, requests))
+    try:
+        yield counters
+    finally:
+        _job_records.reset(token)
+
+def count_for_job(name, n=1):
+    records = _job_records.get()
+    if records is not None:
+        with _counter_lock:
+            records[0][name] = records[0].get(name, 0) + n
+
+# ================= CONCURRENCY =================
+def map_concurrent(fn, items, max_workers=MAX_WORKERS):
+    """fn over items on a bounded thread pool, results in input order."""
+    items = list(items)
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+
+    # Pool threads run in a copy of the caller's context, so job counters follow
+    context = contextvars.copy_context()
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        return list(pool.map(lambda item: context.copy().run(fn, item), items))
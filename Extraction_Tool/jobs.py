@@ -0,0 +1,172 @@
+"""
+Background extraction jobs with per-date checkpoints.
+
+A job runs on a worker thread of the Streamlit server process, so it keeps
+going when the browser session disconnects. Its state lives on disk:
+
+    .extraction_cache/jobs/<job_id>/job.json          status, progress, cache counters and request metrics
+    .extraction_cache/jobs/<job_id>/pages/<league>/<et_date>   checkpointed pages
+    .extraction_cache/jobs/<job_id>/result.parquet    final fixtures
+
+The job id is derived from the extraction parameters. Submitting the same
+extraction again therefore resumes an interrupted or failed job from its
+checkpoints instead of fetching every date again. Only the newest
+KEEP_JOBS job directories are kept.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from extract import PAGE_WORKERS, assemble_fixtures, berlin_range, extraction_tasks, page_fetcher
+from fetch import REQUEST_LOG_SIZE, counting_for_job, map_concurrent, request_metrics
+
+JOBS_DIR = os.environ.get(
+    "EXTRACTION_JOBS_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".extraction_cache", "jobs")
+)
+MAX_JOBS = 2
+KEEP_JOBS = 20
+# Venue cache and schedule store counters kept per job in job.json
+COUNTERS = ["venue_hits", "venue_misses", "venue_expired", "schedule_fetched", "schedule_reused"]
+
+_executor = ThreadPoolExecutor(max_workers=MAX_JOBS, thread_name_prefix="extraction-job")
+_running = {}
+_lock = threading.RLock()
+
+# ================= JOB STATE =================
+def job_id_for(params):
+    text = json.dumps(params, sort_keys=True)
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+def _job_dir(job_id):
+    return os.path.join(JOBS_DIR, job_id)
+
+def _page_path(job_id, league_key, et_date):
+    return os.path.join(_job_dir(job_id), "pages", league_key, f"{et_date}.parquet")
+
+def _write_state(job_id, state):
+    path = os.path.join(_job_dir(job_id), "job.json")
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({**state, "updated": time.time()}, f)
+    os.replace(tmp_path, path)
+
+def job_status(job_id):
+    """Job state dict, or None for an unknown job. Stale "running" jobs read as "interrupted"."""
+    try:
+        with open(os.path.join(_job_dir(job_id), "job.json"), encoding="utf-8") as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    with _lock:
+        alive = job_id in _running and not _running[job_id].done()
+    if state["status"] in ("queued", "running") and not alive:
+        state["status"] = "interrupted"
+    return state
+
+def job_result(job_id):
+    path = os.path.join(_job_dir(job_id), "result.parquet")
+    return pd.read_parquet(path) if os.path.exists(path) else None
+
+def list_jobs():
+    """Known jobs, newest first."""
+    if not os.path.isdir(JOBS_DIR):
+        return []
+    jobs = [(job_id, job_status(job_id)) for job_id in os.listdir(JOBS_DIR)]
+    jobs = [(job_id, state) for job_id, state in jobs if state]
+    return sorted(jobs, key=lambda job: job[1]["updated"], reverse=True)
+
+# ================= RUNNER =================
+def _run(job_id, params):
+    berlin_start, berlin_end = berlin_range(params["start_date"], params["end_date"])
+    tasks = extraction_tasks(params["start_date"], params["end_date"], params["leagues"])
+    fetchers = {
+        league_key: page_fetcher(league_key, params["incremental"], params["source"])
+        for league_key in params["leagues"]
+    }
+
+    done = [task for task in tasks if os.path.exists(_page_path(job_id, *task))]
+    counters = dict.fromkeys(COUNTERS, 0)
+    requests = deque(maxlen=REQUEST_LOG_SIZE)
+    state = {"params": params, "status": "running", "total": len(tasks),
+             "done": len(done), "resumed_from": len(done), "error": None, "rows": None,
+             "counters": counters}
+    _write_state(job_id, state)
+    state_lock = threading.Lock()
+
+    def fetch_checkpointed(task):
+        path = _page_path(job_id, *task)
+        if os.path.exists(path):
+            return pd.read_parquet(path)
+
+        page = fetchers[task[0]](task[1])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        page.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+        with state_lock:
+            state["done"] += 1
+            _write_state(job_id, state)
+        return page
+
+    try:
+        # One pool for every league and date; the rate and concurrency
+        # limits in fetch.py are shared with any other running job
+        with counting_for_job(counters, requests):
+            pages = map_concurrent(fetch_checkpointed, tasks, max_workers=PAGE_WORKERS)
+        result = assemble_fixtures(pages, berlin_start, berlin_end)
+        result.to_parquet(os.path.join(_job_dir(job_id), "result.parquet"), index=False)
+        state.update(status="done", rows=len(result))
+    except Exception as e:
+        # Checkpoints written so far are kept for the resume
+        state.update(status="failed", error=f"{type(e).__name__}: {e}")
+    # Through to_json, so numpy values become plain JSON numbers
+    state["metrics"] = json.loads(request_metrics(requests).to_json(orient="records"))
+    _write_state(job_id, state)
+
+def submit_extraction(start_date, end_date, leagues, incremental=False, source="schedule"):
+    """
+    Start an extraction job and return its id. A running job is reused, an
+    interrupted or failed one resumes from its checkpoints, and a finished
+    one starts over so the data is fresh.
+    """
+    params = {"start_date": start_date, "end_date": end_date, "leagues": list(leagues),
+              "incremental": incremental, "source": source}
+    job_id = job_id_for(params)
+
+    with _lock:
+        if job_id in _running and not _running[job_id].done():
+            return job_id
+
+        previous = job_status(job_id)
+        if previous and previous["status"] == "done":
+            shutil.rmtree(_job_dir(job_id), ignore_errors=True)
+
+        os.makedirs(_job_dir(job_id), exist_ok=True)
+        result_path = os.path.join(_job_dir(job_id), "result.parquet")
+        if os.path.exists(result_path):
+            os.remove(result_path)
+        _write_state(job_id, {"params": params, "status": "queued", "total": None, "done": 0,
+                              "resumed_from": 0, "error": None, "rows": None})
+        _running[job_id] = _executor.submit(_run, job_id, params)
+        prune_jobs()
+
+    return job_id
+
+def prune_jobs(keep=KEEP_JOBS):
+    """Drop all but the newest `keep` job directories; running jobs are kept."""
+    with _lock:
+        for job_id, state in list_jobs()[keep:]:
+            if job_id in _running and not _running[job_id].done():
+                continue
+            shutil.rmtree(_job_dir(job_id), ignore_errors=True)
+            _running.pop(job_id, None)
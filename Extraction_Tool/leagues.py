@@ -0,0 +1,69 @@
+"""
+League registry for the ESPN extraction engine.
+
+Each league knows its ESPN sport and league slug, which gives its schedule
+page, scoreboard and game summary endpoints. Adding a league is one entry
+in LEAGUES.
+"""
+import os
+
+# ESPN_API_BASE can point the scoreboard at a stand-in server (replay_server.py)
+API_BASE = os.environ.get("ESPN_API_BASE", "https://site.api.espn.com")
+SUMMARY_BASE = "https://site.web.api.espn.com"
+
+class League:
+    """
+    sport/slug are ESPN's path segments (basketball/mens-college-basketball).
+    groups limits the scoreboard to a division (50 = NCAA Division I
+    basketball, 80 = FBS). ESPN's football schedule pages are organised by
+    week rather than date, so leagues with schedule_pages=False always use
+    the scoreboard source. name_field is the scoreboard team field used as
+    the team name: "location" ("Duke") identifies a college, but pro teams
+    share cities, so they use "displayName" ("New York Giants").
+    """
+
+    def __init__(self, key, label, sport, slug, groups=None, schedule_pages=True, name_field="location"):
+        self.key = key
+        self.label = label
+        self.sport = sport
+        self.slug = slug
+        self.groups = groups
+        self.schedule_pages = schedule_pages
+        self.name_field = name_field
+
+    def schedule_url(self, et_date):
+        return f"https://www.espn.com/{self.slug}/schedule/_/date/{et_date}"
+
+    def scoreboard_url(self, et_date, api_base=None):
+        url = (
+            f"{api_base or API_BASE}/apis/site/v2/sports/{self.sport}/{self.slug}/scoreboard"
+            f"?dates={et_date}&limit=500"
+        )
+        return url + f"&groups={self.groups}" if self.groups else url
+
+    def summary_url(self, event_id):
+        return f"{SUMMARY_BASE}/apis/site/v2/sports/{self.sport}/{self.slug}/summary?event={event_id}"
+
+    def game_url(self, event_id):
+        return f"https://www.espn.com/{self.slug}/game/_/gameId/{event_id}"
+
+LEAGUES = {
+    league.key: league
+    for league in (
+        League("ncaam", "NCAA Men's Basketball", "basketball", "mens-college-basketball", groups=50),
+        League("ncaaw", "NCAA Women's Basketball", "basketball", "womens-college-basketball", groups=50),
+        League("ncaaf", "NCAA Football (FBS)", "football", "college-football", groups=80, schedule_pages=False),
+        League("ncaah", "NCAA Men's Hockey", "hockey", "mens-college-hockey"),
+        League("nba", "NBA", "basketball", "nba", name_field="displayName"),
+        League("wnba", "WNBA", "basketball", "wnba", name_field="displayName"),
+        League("nhl", "NHL", "hockey", "nhl", name_field="displayName"),
+        League("nfl", "NFL", "football", "nfl", schedule_pages=False, name_field="displayName"),
+    )
+}
+
+DEFAULT_LEAGUES = ["ncaam"]
+
+def get_league(key):
+    if key not in LEAGUES:
+        raise ValueError(f"Unknown league: {key}")
+    return LEAGUES[key]
@@ -0,0 +1,118 @@
+"""
+Schedule page parser benchmark.
+
+    python parse_benchmark.py --save mens-college-basketball 20250301 20250302
+    python parse_benchmark.py                  # every saved page in html_fixtures/
+    python parse_benchmark.py --synthetic 300  # generated page, no saved pages needed
+
+For each parser in parsing.PARSERS it reports rows/second and pages/second
+over the pages, and whether its rows are identical to html.parser's.
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+import pandas as pd
+
+from parsing import PARSERS, available_parsers
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(HERE, "html_fixtures")
+
+def save_pages(sport_slug, et_dates):
+    from fetch import http_get
+
+    os.makedirs(FIXTURE_DIR, exist_ok=True)
+    for et_date in et_dates:
+        url = f"https://www.espn.com/{sport_slug}/schedule/_/date/{et_date}"
+        path = os.path.join(FIXTURE_DIR, f"{sport_slug}_{et_date}.html")
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(http_get(url, headers={"User-Agent": "Mozilla/5.0"}).text)
+        print(f"saved {path}")
+
+def synthetic_page(n_rows):
+    """
+    Schedule-shaped page with script/nav padding comparable to a real one.
+    One extra row carries a <script> inside a cell, which every parser
+    must leave out of the cell text.
+    """
+    rows = "".join(
+        "<tr>"
+        f'<td><a href="/team/_/id/{i}"><span>{i % 25 + 1}</span> Away Team {i}</a></td>'
+        f'<td><span>@</span><a href="/team/_/id/{i + 1000}">Home Team {i}</a></td>'
+        f'<td><a href="/mens-college-basketball/game/_/gameId/40{i:07d}">{i % 12 + 1}:00 PM</a></td>'
+        "<td>ESPN+</td><td>Tickets</td>"
+        "</tr>"
+        for i in range(n_rows)
+    ) + (
+        "<tr>"
+        '<td><a href="/team/_/id/1">Away Team</a></td>'
+        '<td><span>@</span><a href="/team/_/id/2">Home Team</a></td>'
+        "<td><a>7:00 PM</a><script>var a=1</script></td>"
+        "<td>ESPN+</td><td>Tickets</td>"
+        "</tr>"
+    )
+    padding = (
+        "<script>var state = '" + "x" * 200000 + "';</script>"
+        "<nav><ul>" + "<li><a href='#'>Link</a></li>" * 2000 + "</ul></nav>"
+    )
+    return (
+        f"<html><head>{padding}</head><body>"
+        f"<table><thead><tr><th>Matchup</th></tr></thead><tbody>{rows}</tbody></table>"
+        "</body></html>"
+    )
+
+def run_benchmark(pages, repeat=3):
+    reference = [PARSERS["html.parser"](html) for html in pages]
+    n_rows = sum(len(rows) for rows in reference)
+
+    results = []
+    for name in available_parsers():
+        parser = PARSERS[name]
+        start = time.perf_counter()
+        for _ in range(repeat):
+            parsed = [parser(html) for html in pages]
+        elapsed = (time.perf_counter() - start) / repeat
+
+        results.append({
+            "Parser": name,
+            "Rows": n_rows,
+            "Seconds": round(elapsed, 4),
+            "Rows/sec": round(n_rows / elapsed) if elapsed else float("inf"),
+            "Pages/sec": round(len(pages) / elapsed, 1) if elapsed else float("inf"),
+            "Same rows": parsed == reference,
+        })
+
+    return pd.DataFrame(results)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark ESPN schedule page parsers.")
+    parser.add_argument("--save", nargs="+", metavar=("SPORT_SLUG", "ET_DATE"),
+                        help="download schedule pages into html_fixtures/ first")
+    parser.add_argument("--synthetic", type=int, metavar="ROWS",
+                        help="benchmark a generated page with ROWS games instead of saved pages")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    if args.save:
+        save_pages(args.save[0], args.save[1:])
+
+    if args.synthetic:
+        pages = [synthetic_page(args.synthetic)]
+    else:
+        paths = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*.html")))
+        if not paths:
+            parser.error("no saved pages in html_fixtures/; use --save or --synthetic")
+        pages = []
+        for path in paths:
+            with open(path, encoding="utf-8") as f:
+                pages.append(f.read())
+
+    print(f"{len(pages)} page(s)")
+    print(run_benchmark(pages, args.repeat).to_string(index=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
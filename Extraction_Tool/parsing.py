@@ -0,0 +1,86 @@
+"""
+ESPN schedule page parsers.
+
+Every parser returns the same raw rows, in page order:
+{"away": ..., "home": ..., "time_status": ..., "game_href": ...}, taken
+from each "table tbody tr" with at least three cells.
+
+* html.parser - BeautifulSoup over the whole page (the original path)
+* strainer    - BeautifulSoup with the lxml tree builder, building only
+                the <tbody> elements
+* lxml        - lxml.html with XPath, no BeautifulSoup tree at all
+"""
+import importlib.util
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+def _installed(module):
+    return importlib.util.find_spec(module) is not None
+
+HAS_LXML = _installed("lxml")
+
+def _raw_row(texts, hrefs):
+    return {
+        "away": texts[0],
+        "home": texts[1],
+        "time_status": texts[2],
+        "game_href": next((href for href in hrefs if "gameId" in href), ""),
+    }
+
+# ================= PARSERS =================
+def _parse_soup(soup):
+    rows = []
+    for row in soup.select("table tbody tr"):
+        cols = row.find_all("td")
+        if len(cols) < 3:
+            continue
+        texts = [col.get_text(strip=True) for col in cols[:3]]
+        rows.append(_raw_row(texts, [a["href"] for a in row.find_all("a", href=True)]))
+    return rows
+
+def parse_html_parser(html):
+    return _parse_soup(BeautifulSoup(html, "html.parser"))
+
+def parse_strainer(html):
+    # Only <tbody> subtrees are built; the table ancestor is implied
+    soup = BeautifulSoup(html, "lxml", parse_only=SoupStrainer("tbody"))
+    rows = []
+    for row in soup.find_all("tr"):
+        cols = row.find_all("td")
+        if len(cols) < 3:
+            continue
+        texts = [col.get_text(strip=True) for col in cols[:3]]
+        rows.append(_raw_row(texts, [a["href"] for a in row.find_all("a", href=True)]))
+    return rows
+
+def parse_lxml(html):
+    from lxml import etree, html as lxml_html
+
+    tree = lxml_html.fromstring(html)
+    # BeautifulSoup's get_text() leaves out script and style contents;
+    # the tails after them are still cell text
+    etree.strip_elements(tree, "script", "style", with_tail=False)
+    rows = []
+    for row in tree.xpath("//table//tbody//tr"):
+        cols = row.xpath(".//td")
+        if len(cols) < 3:
+            continue
+        # Same text as BeautifulSoup's get_text(strip=True) now that
+        # script and style are gone
+        texts = ["".join(s.strip() for s in col.itertext()) for col in cols[:3]]
+        rows.append(_raw_row(texts, row.xpath(".//a/@href")))
+    return rows
+
+PARSERS = {
+    "html.parser": parse_html_parser,
+    "strainer": parse_strainer,
+    "lxml": parse_lxml,
+}
+
+DEFAULT_PARSER = "lxml" if HAS_LXML else "html.parser"
+
+def available_parsers():
+    return [name for name in PARSERS if name == "html.parser" or HAS_LXML]
+
+def parse_schedule(html, parser=DEFAULT_PARSER):
+    return PARSERS[parser](html)
@@ -0,0 +1,157 @@
+"""
+Record ESPN scoreboard responses and replay them from a local stand-in server.
+
+    python replay_server.py record ncaam 20250301 20250302
+    python replay_server.py serve --port 8765     # then ESPN_API_BASE=http://127.0.0.1:8765
+    python replay_server.py check
+
+record saves each response under recorded/<league>/<et_date>.json,
+plus the rows the scoreboard source extracts from it (<et_date>.csv).
+check serves the recorded responses on a local port, runs the scoreboard
+source against that server, and compares its rows with the recorded ones.
+It exits with status 1 on any difference. Both resolve team names through
+the same alias table (team_aliases.json), and check writes its venue and
+response caches to a temporary directory, not the real ones.
+
+The committed recordings are small hand-checked scoreboards: scheduled
+games in and around daylight-saving changes, plus final, postponed,
+time-TBD and venue-less events that must be skipped or left blank.
+"""
+import argparse
+import glob
+import json
+import os
+import sys
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pandas as pd
+
+import extract
+import fetch
+import leagues
+from leagues import LEAGUES
+from venue_cache import VenueCache
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+RECORDED_DIR = os.path.join(HERE, "recorded")
+
+def _snapshot(df):
+    # Compared as text, so dtypes and time zones do not matter
+    return df.astype("string").fillna("").reset_index(drop=True)
+
+# ================= RECORD =================
+def record(league_key, et_dates):
+    from fetch import http_get
+
+    league = LEAGUES[league_key]
+    out_dir = os.path.join(RECORDED_DIR, league_key)
+    os.makedirs(out_dir, exist_ok=True)
+
+    for et_date in et_dates:
+        data = http_get(league.scoreboard_url(et_date), headers=extract.HEADERS).json()
+        with open(os.path.join(out_dir, f"{et_date}.json"), "w", encoding="utf-8") as f:
+            json.dump(data, f)
+
+        rows = extract.parse_scoreboard(data, league, extract.load_alias_table())
+        _snapshot(rows).to_csv(os.path.join(out_dir, f"{et_date}.csv"), index=False)
+        print(f"{league_key} {et_date}: {len(data.get('events', []))} events, {len(rows)} fixtures")
+
+# ================= SERVE =================
+class ReplayHandler(BaseHTTPRequestHandler):
+    """Answers .../<sport>/<league slug>/scoreboard?dates=<et_date> from RECORDED_DIR."""
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        parts = url.path.rstrip("/").split("/")
+        et_date = parse_qs(url.query).get("dates", [""])[0]
+        slugs = {league.slug: key for key, league in LEAGUES.items()}
+        league_key = slugs.get(parts[-2]) if len(parts) >= 2 else None
+        path = os.path.join(RECORDED_DIR, league_key, f"{et_date}.json") if league_key else ""
+
+        if parts[-1] != "scoreboard" or not os.path.exists(path):
+            self.send_error(404)
+            return
+
+        with open(path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def start_server(port=0):
+    server = ThreadingHTTPServer(("127.0.0.1", port), ReplayHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+# ================= CHECK =================
+def check():
+    recordings = sorted(glob.glob(os.path.join(RECORDED_DIR, "*", "*.json")))
+    if not recordings:
+        print("no recorded responses; run 'record' first")
+        return 1
+
+    server = start_server()
+    leagues.API_BASE = f"http://127.0.0.1:{server.server_port}"
+    failed = 0
+
+    # Replayed venues and responses must not end up in the real caches
+    scratch = tempfile.TemporaryDirectory()
+    real_cache, real_response_dir = extract.VENUE_CACHE, fetch.RESPONSE_CACHE_DIR
+    extract.VENUE_CACHE = VenueCache(os.path.join(scratch.name, "venues.sqlite"))
+    fetch.RESPONSE_CACHE_DIR = os.path.join(scratch.name, "responses")
+
+    try:
+        for path in recordings:
+            league_key = os.path.basename(os.path.dirname(path))
+            et_date = os.path.splitext(os.path.basename(path))[0]
+
+            rows = _snapshot(extract.fetch_espn_scoreboard_by_et_date(et_date, LEAGUES[league_key]))
+            expected = pd.read_csv(path[:-5] + ".csv", dtype="string", keep_default_na=False)
+            expected = _snapshot(expected) if len(expected.columns) else rows.iloc[0:0]
+
+            ok = rows.equals(expected)
+            failed += not ok
+            print(f"{league_key} {et_date}: {len(rows)} fixtures {'ok' if ok else 'DIFFERS'}")
+    finally:
+        server.shutdown()
+        if extract.VENUE_CACHE.conn is not None:
+            extract.VENUE_CACHE.conn.close()
+        extract.VENUE_CACHE, fetch.RESPONSE_CACHE_DIR = real_cache, real_response_dir
+        scratch.cleanup()
+
+    return 1 if failed else 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and replay ESPN scoreboard responses.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_cmd = commands.add_parser("record", help="save live scoreboard responses")
+    record_cmd.add_argument("league", choices=list(LEAGUES))
+    record_cmd.add_argument("et_dates", nargs="+", metavar="ET_DATE")
+
+    serve_cmd = commands.add_parser("serve", help="serve recorded responses")
+    serve_cmd.add_argument("--port", type=int, default=8765)
+
+    commands.add_parser("check", help="replay recordings through the scoreboard source")
+
+    args = parser.parse_args(argv)
+    if args.command == "record":
+        record(args.league, args.et_dates)
+        return 0
+    if args.command == "serve":
+        server = ThreadingHTTPServer(("127.0.0.1", args.port), ReplayHandler)
+        print(f"serving {RECORDED_DIR} on http://127.0.0.1:{args.port}")
+        server.serve_forever()
+        return 0
+    return check()
+
+if __name__ == "__main__":
+    sys.exit(main())
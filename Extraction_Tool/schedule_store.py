@@ -0,0 +1,83 @@
+"""
+Local store of parsed schedule pages, one Parquet file per source/sport
+and ET date.
+
+Incremental extraction reuses a stored page instead of fetching it again
+when the page can no longer change: it was fetched after the ET date (plus
+FINAL_GRACE_HOURS) had ended, so every game on it was already final.
+Other pages are refetched once their copy is older than REFRESH_MINUTES.
+"""
+import os
+import threading
+import time
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+
+from fetch import count_for_job
+
+STORE_DIR = os.environ.get(
+    "SCHEDULE_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".extraction_cache", "schedules")
+)
+ET_TZ = ZoneInfo("America/New_York")
+
+FINAL_GRACE_HOURS = 12
+REFRESH_MINUTES = 15
+
+class ScheduleStore:
+    def __init__(self, path=STORE_DIR):
+        self.path = path
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {"fetched": 0, "reused": 0}
+
+    def _page_path(self, key, et_date):
+        return os.path.join(self.path, key, f"{et_date}.parquet")
+
+    def load(self, key, et_date):
+        """(page, fetched_at) for a stored page, else (None, None)."""
+        path = self._page_path(key, et_date)
+        try:
+            return pd.read_parquet(path), os.path.getmtime(path)
+        except (OSError, ValueError):
+            return None, None
+
+    def save(self, key, et_date, page):
+        path = self._page_path(key, et_date)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        page.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def is_current(self, et_date, fetched_at, now=None):
+        if fetched_at is None:
+            return False
+        now = time.time() if now is None else now
+
+        day_end = datetime.strptime(et_date, "%Y%m%d").replace(tzinfo=ET_TZ) + timedelta(days=1)
+        if fetched_at >= (day_end + timedelta(hours=FINAL_GRACE_HOURS)).timestamp():
+            return True
+        return now - fetched_at < REFRESH_MINUTES * 60
+
+    def page(self, key, et_date, fetch_page, refresh=False):
+        """Stored page when still current, otherwise fetch_page(et_date) and store it."""
+        if not refresh:
+            page, fetched_at = self.load(key, et_date)
+            if page is not None and self.is_current(et_date, fetched_at):
+                with self.lock:
+                    self.stats["reused"] += 1
+                count_for_job("schedule_reused")
+                return page
+
+        page = fetch_page(et_date)
+        self.save(key, et_date, page)
+        with self.lock:
+            self.stats["fetched"] += 1
+        count_for_job("schedule_fetched")
+        return page
+
+SCHEDULE_STORE = ScheduleStore()
@@ -0,0 +1,89 @@
+"""
+Persistent venue cache keyed by ESPN event id.
+
+A game's venue almost never changes, so lookups are answered from a local
+SQLite file before any summary API call. Entries expire after
+VENUE_TTL_DAYS and the table is trimmed to MAX_ENTRIES, least recently
+used first.
+"""
+import os
+import sqlite3
+import threading
+import time
+
+from fetch import count_for_job
+
+CACHE_PATH = os.environ.get(
+    "VENUE_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".extraction_cache", "venues.sqlite")
+)
+VENUE_TTL_DAYS = 30
+MAX_ENTRIES = 50000
+
+class VenueCache:
+    def __init__(self, path=CACHE_PATH, ttl_days=VENUE_TTL_DAYS, max_entries=MAX_ENTRIES):
+        self.path = path
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.conn = None
+        self.reset_stats()
+
+    def _connect(self):
+        # Opened lazily and shared by the lookup threads, guarded by self.lock
+        if self.conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS venues ("
+                " event_id TEXT PRIMARY KEY, venue TEXT, city TEXT,"
+                " fetched_at REAL, used_at REAL)"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS venues_used ON venues (used_at)")
+        return self.conn
+
+    def reset_stats(self):
+        self.stats = {"hits": 0, "misses": 0, "expired": 0}
+
+    def get(self, event_id):
+        """(venue, city) for a cached, unexpired event, else None."""
+        now = time.time()
+        with self.lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT venue, city, fetched_at FROM venues WHERE event_id = ?", (event_id,)
+            ).fetchone()
+
+            if row is None:
+                self.stats["misses"] += 1
+                count_for_job("venue_misses")
+                return None
+            if now - row[2] > self.ttl:
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                count_for_job("venue_expired")
+                count_for_job("venue_misses")
+                return None
+
+            conn.execute("UPDATE venues SET used_at = ? WHERE event_id = ?", (now, event_id))
+            conn.commit()
+            self.stats["hits"] += 1
+            count_for_job("venue_hits")
+            return row[0], row[1]
+
+    def put(self, event_id, venue, city):
+        now = time.time()
+        with self.lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO venues VALUES (?, ?, ?, ?, ?)",
+                (event_id, venue, city, now, now)
+            )
+            conn.execute(
+                "DELETE FROM venues WHERE event_id IN ("
+                " SELECT event_id FROM venues ORDER BY used_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+            conn.commit()
+
+VENUE_CACHE = VenueCache()
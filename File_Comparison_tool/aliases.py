@@ -0,0 +1,91 @@
+"""
+Team-name aliases for fixture comparison.
+
+team_names.py at the repository root holds the table storage and the key
+functions shared with the extraction tool; this module adds description
+keys and alias learning. Learned aliases come from fixture pairs the
+fuzzy matcher accepted, so the next comparison resolves them with a plain
+dict lookup instead of fuzzy scoring. They are kept apart from the
+approved aliases and the extraction tool ignores them until someone
+moves them into "aliases" in team_aliases.json.
+"""
+import os
+import re
+import sys
+from difflib import SequenceMatcher
+
+# team_names.py lives at the repository root, next to team_aliases.json
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_ROOT not in sys.path:
+    sys.path.append(REPO_ROOT)
+
+from team_names import (
+    ALIASES_FILE, canonical_key, load_alias_table, save_alias_table, table_digest, team_key
+)
+
+# Minimum team-level similarity before a fuzzy pair teaches a new alias.
+# Spelling slips pass ("Mississipi State"); different teams with similar
+# names do not (Kansas / Arkansas 0.86, North Carolina A&T / North
+# Carolina 0.88). Names that only add or drop words are never learned.
+ALIAS_MIN_SCORE = 0.95
+
+# ================= KEYS =================
+def with_learned(table):
+    """table with its learned aliases applied alongside the approved ones."""
+    learned = table.get("learned") or {}
+    if not learned:
+        return table
+    return {**table, "aliases": {**learned, **table["aliases"]}}
+
+def split_description(desc):
+    """'Home v Away' -> ['Home', 'Away']; anything else is a single part."""
+    return re.split(r"\s+v\s+", str(desc), maxsplit=1)
+
+def description_key(desc, table):
+    return " v ".join(canonical_key(team, table) for team in split_description(desc))
+
+def description_keys(descriptions, table):
+    """description_key() for a Series, computed once per distinct value; learned aliases apply."""
+    table = with_learned(table)
+    keys = {desc: description_key(desc, table) for desc in descriptions.dropna().unique()}
+    return descriptions.map(keys).fillna("")
+
+# ================= LEARNING =================
+def learn_aliases(table, pairs):
+    """
+    Record team aliases from accepted (old_description, new_description)
+    pairs under table["learned"]. The OLD file's spelling is treated as
+    canonical. Returns the updated table and the number of aliases added.
+    """
+    known = dict(with_learned(table)["aliases"])
+    learned = dict(table.get("learned") or {})
+    added = 0
+
+    for old_desc, new_desc in pairs:
+        old_teams = split_description(old_desc)
+        new_teams = split_description(new_desc)
+        if len(old_teams) != len(new_teams):
+            continue
+
+        for old_team, new_team in zip(old_teams, new_teams):
+            new_key = team_key(new_team, table)
+            if not new_key or new_key in known:
+                continue
+            current = {**table, "aliases": known}
+            if canonical_key(old_team, current) == canonical_key(new_team, current):
+                continue
+            old_key = team_key(old_team, table)
+            # "Iowa" / "Iowa State", "Texas" / "Texas A&M": another team, not a spelling
+            if set(old_key.split()) <= set(new_key.split()) or set(new_key.split()) <= set(old_key.split()):
+                continue
+            if SequenceMatcher(None, old_key, new_key).ratio() >= ALIAS_MIN_SCORE:
+                learned[new_key] = known[new_key] = known.get(old_key, old_team.strip())
+                added += 1
+
+    return {**table, "learned": learned}, added
+
+def learn_from_report(table, final_df):
+    """learn_aliases() over the paired rows of a comparison report."""
+    paired = final_df[~final_df["Change Type"].isin(["ADDED", "REMOVED"])]
+    renamed = paired[paired["Description_OLD"].astype(str) != paired["Description_NEW"].astype(str)]
+    return learn_aliases(table, zip(renamed["Description_OLD"], renamed["Description_NEW"]))
@@ -1,28 +1,21 @@
 import streamlit as st
-import pandas as pd
-from difflib import SequenceMatcher
-from openpyxl import load_workbook
-from openpyxl.styles import PatternFill
-import tempfile
+import hashlib
+import io
 import os
 
+from aliases import learn_from_report, load_alias_table, save_alias_table, table_digest
+from compare import REQUIRED_COLS, compare_fixtures
+from ingest import read_fixtures
+from matching import MATCH_THRESHOLD, default_threshold
+from report import export_report
+from similarity import BACKENDS, DEFAULT_BACKEND, available_backends
+
 # ================= PAGE CONFIG =================
 st.set_page_config(page_title="Fixture Comparison Tool", layout="wide")
 
 st.title("Fixture Comparison Tool")
 st.caption("Detect added, removed, modified fixtures (including spelling differences)")
 
-# ================= NORMALIZATION =================
-def normalize_desc(text):
-    if pd.isna(text):
-        return ""
-    return " ".join(text.lower().split())
-
-def similarity(a, b):
-    return SequenceMatcher(None, a, b).ratio()
-
-MATCH_THRESHOLD = 0.9
-
 # ================= STREAMLIT HIGHLIGHT =================
 def highlight_row(row):
     if row["Change Type"] == "ADDED":
@@ -33,98 +26,111 @@ def highlight_row(row):
         return ["background-color: #FFEB9C"] * len(row)
     return [""] * len(row)
 
+# ================= CACHING =================
+# Keyed by a hash of the uploaded bytes, so widget reruns on the same files
+# skip parsing and matching. max_entries bounds memory (LRU eviction).
+CACHE_ENTRIES = 8
+
+def file_digest(uploaded):
+    return hashlib.sha256(uploaded.getvalue()).hexdigest()
+
+@st.cache_data(max_entries=2 * CACHE_ENTRIES, show_spinner="Reading workbook...")
+def read_upload(digest, _uploaded):
+    return read_fixtures(_uploaded, REQUIRED_COLS, file_name=_uploaded.name)
+
+@st.cache_data(max_entries=CACHE_ENTRIES, show_spinner="Comparing fixtures...")
+def run_comparison(old_digest, new_digest, threshold, mode, block_by_date, backend, columns,
+                   aliases_digest, _old_df, _new_df, _aliases=None, _workers=1):
+    # Worker count does not change the result, so it is left out of the key;
+    # the alias table is keyed by its digest
+    final_df = compare_fixtures(
+        _old_df, _new_df, threshold,
+        mode=mode,
+        block_by_date=block_by_date,
+        workers=_workers,
+        backend=backend,
+        aliases=_aliases
+    )
+
+    buffer = io.BytesIO()
+    export_report(final_df, buffer)
+    return final_df, buffer.getvalue()
+
 # ================= FILE UPLOAD =================
+FILE_TYPES = ["xlsx", "csv", "parquet"]
+
 col1, col2 = st.columns(2)
 
 with col1:
-    old_file = st.file_uploader("Upload OLD Fixture File", type=["xlsx"])
+    old_file = st.file_uploader("Upload OLD Fixture File", type=FILE_TYPES)
 
 with col2:
-    new_file = st.file_uploader("Upload NEW Fixture File", type=["xlsx"])
+    new_file = st.file_uploader("Upload NEW Fixture File", type=FILE_TYPES)
+
+# ================= MATCHING OPTIONS =================
+MATCH_MODES = {
+    "Greedy (file order)": "greedy",
+    "Optimal assignment": "assignment",
+}
+
+backends = available_backends()
+backend = st.selectbox(
+    "Similarity Backend",
+    backends,
+    index=backends.index(DEFAULT_BACKEND),
+    format_func=lambda name: BACKENDS[name].label
+)
+
+col3, col4, col5, col6 = st.columns(4)
+
+with col3:
+    match_mode = st.radio("Matching Mode", list(MATCH_MODES), horizontal=True)
+
+with col4:
+    threshold = st.slider(
+        "Match Threshold", 0.5, 1.0, default_threshold(backend), 0.01,
+        help=f"Defaults to the backend's calibrated threshold ({default_threshold(backend)} for {backend}, "
+             f"{MATCH_THRESHOLD} for difflib); see benchmark.py --calibrate"
+    )
+
+with col5:
+    block_by_date = st.checkbox(
+        "Only pair fixtures with the same Start Date",
+        disabled=MATCH_MODES[match_mode] != "assignment"
+    )
+
+with col6:
+    workers = st.number_input(
+        "Scoring Processes", min_value=1, max_value=os.cpu_count() or 1, value=1
+    )
+
+use_aliases = st.checkbox(
+    "Resolve team-name aliases before fuzzy matching",
+    value=True,
+    help="Uses the shared team_aliases.json table"
+)
+aliases = load_alias_table() if use_aliases else None
 
 if old_file and new_file:
     st.success("Files uploaded successfully!")
 
-    old_df = pd.read_excel(old_file)
-    new_df = pd.read_excel(new_file)
-
-    required_cols = ["Start Date", "Start Time", "Description", "Venue"]
-    old_df = old_df[required_cols].copy()
-    new_df = new_df[required_cols].copy()
-
-    # Normalize descriptions
-    old_df["Desc_norm"] = old_df["Description"].apply(normalize_desc)
-    new_df["Desc_norm"] = new_df["Description"].apply(normalize_desc)
-
-    # ================= FUZZY MATCHING =================
-    matched_new = set()
-    pairs = []
-
-    for i, old_row in old_df.iterrows():
-        best_match = None
-        best_score = 0
-
-        for j, new_row in new_df.iterrows():
-            if j in matched_new:
-                continue
-
-            score = similarity(old_row["Desc_norm"], new_row["Desc_norm"])
-            if score > best_score:
-                best_score = score
-                best_match = j
-
-        if best_score >= MATCH_THRESHOLD:
-            matched_new.add(best_match)
-            pairs.append((i, best_match))
-        else:
-            pairs.append((i, None))
-
-    # Add unmatched NEW rows
-    for j in new_df.index:
-        if j not in matched_new:
-            pairs.append((None, j))
-
-    # ================= BUILD COMPARISON =================
-    rows = []
-
-    for old_i, new_i in pairs:
-        old = old_df.loc[old_i] if old_i is not None else None
-        new = new_df.loc[new_i] if new_i is not None else None
-
-        if old is None:
-            change_type = "ADDED"
-        elif new is None:
-            change_type = "REMOVED"
-        else:
-            changes = []
-
-            if old["Description"] != new["Description"]:
-                changes.append("Description")
-            if old["Start Date"] != new["Start Date"]:
-                changes.append("Start Date")
-            if old["Start Time"] != new["Start Time"]:
-                changes.append("Start Time")
-            if old["Venue"] != new["Venue"]:
-                changes.append("Venue")
-
-            change_type = (
-                "MODIFIED (" + ", ".join(changes) + ")"
-                if changes else "NO CHANGE"
-            )
-
-        rows.append({
-            "Change Type": change_type,
-            "Description_OLD": old["Description"] if old is not None else "",
-            "Description_NEW": new["Description"] if new is not None else "",
-            "Start Date_OLD": old["Start Date"] if old is not None else "",
-            "Start Time_OLD": old["Start Time"] if old is not None else "",
-            "Venue_OLD": old["Venue"] if old is not None else "",
-            "Start Date_NEW": new["Start Date"] if new is not None else "",
-            "Start Time_NEW": new["Start Time"] if new is not None else "",
-            "Venue_NEW": new["Venue"] if new is not None else "",
-        })
-
-    final_df = pd.DataFrame(rows)
+    old_digest = file_digest(old_file)
+    new_digest = file_digest(new_file)
+
+    old_df = read_upload(old_digest, old_file)
+    new_df = read_upload(new_digest, new_file)
+
+    # ================= COMPARISON =================
+    try:
+        final_df, report_bytes = run_comparison(
+            old_digest, new_digest, threshold,
+            MATCH_MODES[match_mode], block_by_date, backend, tuple(REQUIRED_COLS),
+            table_digest(aliases) if aliases is not None else None,
+            old_df, new_df, aliases, int(workers)
+        )
+    except ValueError as e:
+        st.error(str(e))
+        st.stop()
 
     # ================= STREAMLIT PREVIEW =================
     st.subheader("Comparison Preview")
@@ -134,47 +140,22 @@ if old_file and new_file:
     )
 
     # ================= EXPORT TO EXCEL =================
-    with tempfile.NamedTemporaryFile(delete=False, suffix=".xlsx") as tmp:
-        output_path = tmp.name
-
-    final_df.to_excel(output_path, index=False)
-
-    wb = load_workbook(output_path)
-    ws = wb.active
-
-    FILL_ADDED = PatternFill("solid", fgColor="C6EFCE")
-    FILL_REMOVED = PatternFill("solid", fgColor="FFC7CE")
-    FILL_MODIFIED = PatternFill("solid", fgColor="FFEB9C")
-
-    header = [cell.value for cell in ws[1]]
-    change_col_idx = header.index("Change Type") + 1
-
-    for r in range(2, ws.max_row + 1):
-        val = ws.cell(r, change_col_idx).value
-
-        if val == "ADDED":
-            fill = FILL_ADDED
-        elif val == "REMOVED":
-            fill = FILL_REMOVED
-        elif str(val).startswith("MODIFIED"):
-            fill = FILL_MODIFIED
-        else:
-            continue
-
-        for c in range(1, ws.max_column + 1):
-            ws.cell(r, c).fill = fill
-
-    wb.save(output_path)
+    st.download_button(
+        label="Download Highlighted Comparison Report",
+        data=report_bytes,
+        file_name="Fixture_Comparison_Report.xlsx",
+        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
 
-    with open(output_path, "rb") as f:
-        st.download_button(
-            label="Download Highlighted Comparison Report",
-            data=f,
-            file_name="Fixture_Comparison_Report.xlsx",
-            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    # ================= TEAM ALIASES =================
+    if aliases is not None and st.button("Save team aliases from this comparison"):
+        aliases, added = learn_from_report(aliases, final_df)
+        if added:
+            save_alias_table(aliases)
+        st.success(
+            f"{added} new team alias(es) saved as learned. The extraction tool uses them "
+            "once they are moved into \"aliases\" in team_aliases.json."
         )
 
-    os.remove(output_path)
-
 else:
-    st.info("Please upload both OLD and NEW Excel files to start comparison.")
+    st.info("Please upload both OLD and NEW fixture files (xlsx, csv or parquet) to start comparison.")
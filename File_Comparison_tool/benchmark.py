@@ -0,0 +1,169 @@
+"""
+Similarity backend benchmark.
+
+    python benchmark.py                      # Old_ones.xlsx vs New_one.xlsx
+    python benchmark.py OLD NEW --repeat 20
+    python benchmark.py --calibrate          # per-backend threshold sweep
+
+For every installed backend it reports raw scoring throughput over all
+old x new description pairs, agreement with difflib on the
+score >= threshold decision, and the time and agreement of the final
+pairing produced by match_descriptions(). Each backend is judged at its
+own calibrated threshold unless --threshold is given.
+
+--calibrate scores a synthetic labelled set instead. One- and
+two-character typos of a fixture must match. A different opponent, or a
+team name extended to another team ("Iowa" / "Iowa State", "Texas" /
+"Texas A&M"), must not. For each backend it prints the threshold with the
+best accuracy, which is what similarity.py's `threshold` values come from.
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from compare import REQUIRED_COLS, prepare_fixtures
+from ingest import read_fixtures
+from matching import MATCH_THRESHOLD, default_threshold, match_descriptions, normalize_desc
+from similarity import BACKENDS, available_backends
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Words that turn one team into another when added to its name
+TEAM_EXTENSIONS = ["state", "a&m", "tech", "christian", "southern", "northern", "st",
+                   "international", "baptist", "city", "wesleyan", "poly"]
+NAMED_PAIRS = [
+    ("Iowa v UNC", "Iowa State v UNC"), ("Texas v Duke", "Texas A&M v Duke"),
+    ("North Carolina v Duke", "North Carolina A&T v Duke"), ("Kansas v Baylor", "Kansas State v Baylor"),
+    ("Texas v TCU", "Texas Tech v TCU"), ("Miami v Clemson", "Miami (OH) v Clemson"),
+]
+
+def score_all(backend, old_norm, new_norm):
+    """Dense old x new score array (batch backends use their matrix path)."""
+    if backend.pairwise:
+        return np.array([[backend.score(a, b) for b in new_norm] for a in old_norm]).reshape(
+            len(old_norm), len(new_norm)
+        )
+    return backend.matrix(old_norm, new_norm, 0.0).toarray()
+
+def timed(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return result, (time.perf_counter() - start) / repeat
+
+def run_benchmark(old_norm, new_norm, threshold=None, repeat=5):
+    reference_threshold = MATCH_THRESHOLD if threshold is None else threshold
+    reference = score_all(BACKENDS["difflib"], old_norm, new_norm)
+    reference_pairs = match_descriptions(old_norm, new_norm, reference_threshold)
+    n_pairs = max(reference.size, 1)
+
+    rows = []
+    for name in available_backends():
+        backend = BACKENDS[name]
+        cut = default_threshold(name) if threshold is None else threshold
+        scores, score_time = timed(lambda: score_all(backend, old_norm, new_norm), repeat)
+        pairs, match_time = timed(lambda: match_descriptions(old_norm, new_norm, cut, backend=name), repeat)
+
+        rows.append({
+            "Backend": name,
+            "Threshold": cut,
+            "Pairs/sec": round(n_pairs / score_time) if score_time else float("inf"),
+            "Decision agreement": ((scores >= cut) == (reference >= reference_threshold)).mean(),
+            "Mean |score diff|": np.abs(scores - reference).mean(),
+            "Match time (s)": round(match_time, 4),
+            "Matched": sum(1 for i, j in pairs if i is not None and j is not None),
+            "Same pairing": pairs == reference_pairs,
+        })
+
+    return pd.DataFrame(rows)
+
+# ================= CALIBRATION =================
+def _typo(text, rng):
+    i = rng.randrange(len(text))
+    letter = rng.choice(string.ascii_lowercase)
+    edit = rng.random()
+    if edit < 0.5:
+        return text[:i] + letter + text[i + 1:]
+    return text[:i] + letter + text[i:] if edit < 0.75 else text[:i] + text[i + 1:]
+
+def calibration_pairs(n_fixtures=1000, seed=0):
+    """(old, new, same fixture?) description pairs, normalized."""
+    rng = random.Random(seed)
+    words = ["".join(rng.choices(string.ascii_lowercase, k=rng.randint(4, 10))) for _ in range(2000)]
+
+    def team():
+        return " ".join(rng.choices(words, k=rng.randint(1, 3)))
+
+    pairs = [(old, new, False) for old, new in NAMED_PAIRS]
+    for _ in range(n_fixtures):
+        home, away = team(), team()
+        desc = f"{home} v {away}"
+        extension = rng.choice(TEAM_EXTENSIONS)
+        pairs += [
+            (desc, _typo(desc, rng), True),
+            (desc, _typo(_typo(desc, rng), rng), True),
+            (desc, f"{home} v {team()}", False),
+            (desc, f"{home} {extension} v {away}" if rng.random() < 0.5 else f"{home} v {away} {extension}", False),
+        ]
+    return [(normalize_desc(old), normalize_desc(new), same) for old, new, same in pairs]
+
+def calibrate(pairs, thresholds=np.arange(0.70, 0.96, 0.01)):
+    """Best-accuracy threshold per backend on calibration_pairs()."""
+    same = np.array([s for _, _, s in pairs])
+    rows = []
+    for name in available_backends():
+        backend = BACKENDS[name]
+        scores = np.array([backend.score(old, new) for old, new, _ in pairs])
+        accuracy = [((scores >= t) == same).mean() for t in thresholds]
+        best = round(float(thresholds[int(np.argmax(accuracy))]), 2)
+        matched = scores >= best
+        rows.append({
+            "Backend": name,
+            "Best threshold": best,
+            "Current threshold": default_threshold(name),
+            "Accuracy": round(max(accuracy), 4),
+            "Typos missed": int((~matched & same).sum()),
+            "Different fixtures matched": int((matched & ~same).sum()),
+        })
+    return pd.DataFrame(rows)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark similarity backends.")
+    parser.add_argument("old", nargs="?", default=os.path.join(HERE, "Old_ones.xlsx"))
+    parser.add_argument("new", nargs="?", default=os.path.join(HERE, "New_one.xlsx"))
+    parser.add_argument("--threshold", type=float, default=None,
+                        help="one threshold for every backend (default: each backend's calibrated one)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--calibrate", action="store_true",
+                        help="sweep thresholds on a synthetic typo / different-team set")
+    args = parser.parse_args(argv)
+
+    if args.calibrate:
+        pairs = calibration_pairs()
+        print(f"{len(pairs)} labelled description pairs")
+        print(calibrate(pairs).to_string(index=False))
+        return 0
+
+    old_df = prepare_fixtures(read_fixtures(args.old, REQUIRED_COLS, cache_dir=None))
+    new_df = prepare_fixtures(read_fixtures(args.new, REQUIRED_COLS, cache_dir=None))
+    old_norm = old_df["Desc_norm"].tolist()
+    new_norm = new_df["Desc_norm"].tolist()
+
+    print(f"{len(old_norm)} old x {len(new_norm)} new descriptions, "
+          f"threshold {args.threshold or 'per backend'}")
+    missing = sorted(set(BACKENDS) - set(available_backends()))
+    if missing:
+        print(f"Not installed, skipped: {', '.join(missing)}")
+
+    report = run_benchmark(old_norm, new_norm, args.threshold, args.repeat)
+    print(report.to_string(index=False))
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,178 @@
+"""
+Fixture comparison engine, usable without Streamlit.
+
+    python compare.py OLD NEW -o Fixture_Comparison_Report.xlsx
+    python compare.py --batch pairs.csv --workers 8
+    python compare.py OLD NEW --learn-aliases
+
+Team names are canonicalized through the shared alias table
+(team_aliases.json, see aliases.py) before fuzzy matching; --learn-aliases
+writes aliases found by the fuzzy matcher back to it as "learned" entries,
+which only the comparison applies until they are approved.
+
+A batch file is a CSV with "old", "new" and "output" columns, one file
+pair per row; pairs are compared in parallel across a process pool.
+"""
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from aliases import ALIASES_FILE, description_keys, learn_from_report, load_alias_table, save_alias_table
+from ingest import CACHE_DIR, read_fixtures
+from matching import MATCH_THRESHOLD, match_fixtures, normalize_desc
+from report import build_comparison, export_report
+from similarity import BACKENDS, DEFAULT_BACKEND
+
+REQUIRED_COLS = ["Start Date", "Start Time", "Description", "Venue"]
+
+# ================= INPUT =================
+def prepare_fixtures(df):
+    missing = [c for c in REQUIRED_COLS if c not in df.columns]
+    if missing:
+        raise ValueError(f"Fixture file is missing columns: {', '.join(missing)}")
+
+    df = df[REQUIRED_COLS].copy()
+    df["Desc_norm"] = df["Description"].apply(normalize_desc)
+    return df
+
+# ================= COMPARISON =================
+def compare_fixtures(old_df, new_df, threshold=None, mode="greedy", block_by_date=False,
+                     workers=1, backend=None, aliases=None):
+    """
+    Compare two fixture frames and return the comparison report frame.
+
+    aliases is an alias table (aliases.load_alias_table()); rows whose
+    canonical descriptions agree are joined before fuzzy matching.
+    """
+    old_df = prepare_fixtures(old_df)
+    new_df = prepare_fixtures(new_df)
+
+    key_col = None
+    if aliases is not None:
+        key_col = "Desc_key"
+        old_df[key_col] = description_keys(old_df["Description"], aliases)
+        new_df[key_col] = description_keys(new_df["Description"], aliases)
+
+    pairs = match_fixtures(
+        old_df, new_df, threshold,
+        mode=mode, block_by_date=block_by_date, workers=workers, backend=backend, key_col=key_col
+    )
+    return build_comparison(old_df, new_df, pairs)
+
+def summarize(final_df):
+    change = final_df["Change Type"]
+    return {
+        "ADDED": int((change == "ADDED").sum()),
+        "REMOVED": int((change == "REMOVED").sum()),
+        "MODIFIED": int(change.str.startswith("MODIFIED").sum()),
+        "NO CHANGE": int((change == "NO CHANGE").sum()),
+    }
+
+def write_report(final_df, output_path):
+    ext = os.path.splitext(str(output_path))[1].lower()
+    if ext == ".csv":
+        final_df.to_csv(output_path, index=False)
+    elif ext == ".parquet":
+        final_df.astype("string").to_parquet(output_path, index=False)
+    else:
+        export_report(final_df, output_path)
+
+def compare_files(old_path, new_path, output_path, cache_dir=CACHE_DIR, aliases_path=ALIASES_FILE,
+                  learn_aliases=False, **options):
+    """Read, compare and write one file pair; returns the change summary."""
+    aliases = load_alias_table(aliases_path) if aliases_path else None
+    final_df = compare_fixtures(
+        read_fixtures(old_path, REQUIRED_COLS, cache_dir=cache_dir),
+        read_fixtures(new_path, REQUIRED_COLS, cache_dir=cache_dir),
+        aliases=aliases,
+        **options
+    )
+    write_report(final_df, output_path)
+
+    summary = summarize(final_df)
+    if learn_aliases and aliases is not None:
+        aliases, summary["ALIASES LEARNED"] = learn_from_report(aliases, final_df)
+        save_alias_table(aliases, aliases_path)
+    return summary
+
+# ================= CLI =================
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compare OLD and NEW fixture files.")
+    parser.add_argument("old", nargs="?", help="OLD fixture file (xlsx, csv or parquet)")
+    parser.add_argument("new", nargs="?", help="NEW fixture file (xlsx, csv or parquet)")
+    parser.add_argument("-o", "--output", default="Fixture_Comparison_Report.xlsx",
+                        help="report path; .xlsx is highlighted, .csv/.parquet are plain")
+    parser.add_argument("--batch", help="CSV of file pairs with old, new and output columns")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="processes for --batch (default: CPU count)")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help=f"match threshold (default: the backend's calibrated default, "
+                             f"{MATCH_THRESHOLD} for difflib/rapidfuzz, "
+                             f"{BACKENDS['token_set'].threshold} for token_set, "
+                             f"{BACKENDS['tfidf'].threshold} for tfidf)")
+    parser.add_argument("--mode", choices=["greedy", "assignment"], default="greedy")
+    parser.add_argument("--block-by-date", action="store_true",
+                        help="assignment mode only: pair fixtures with the same Start Date")
+    parser.add_argument("--backend", choices=list(BACKENDS), default=DEFAULT_BACKEND,
+                        help="description similarity backend (see similarity.py)")
+    parser.add_argument("--match-workers", type=int, default=1,
+                        help="processes used to score one file pair (default: 1)")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="do not read or write Parquet sidecars for xlsx inputs")
+    parser.add_argument("--aliases", default=ALIASES_FILE,
+                        help="team alias table (default: team_aliases.json at the repo root)")
+    parser.add_argument("--no-aliases", action="store_true",
+                        help="match on raw descriptions only")
+    parser.add_argument("--learn-aliases", action="store_true",
+                        help="save team aliases found by the fuzzy matcher to the alias table as learned")
+
+    args = parser.parse_args(argv)
+    if not args.batch and not (args.old and args.new):
+        parser.error("give OLD and NEW files, or --batch")
+    if args.batch and args.learn_aliases:
+        parser.error("--learn-aliases cannot be combined with --batch")
+    return args
+
+def format_summary(summary):
+    return ", ".join(f"{k}: {v}" for k, v in summary.items())
+
+def main(argv=None):
+    args = parse_args(argv)
+    options = {
+        "threshold": args.threshold,
+        "mode": args.mode,
+        "block_by_date": args.block_by_date,
+        "workers": args.match_workers,
+        "backend": args.backend,
+        "cache_dir": None if args.no_cache else CACHE_DIR,
+        "aliases_path": None if args.no_aliases else args.aliases,
+        "learn_aliases": args.learn_aliases,
+    }
+
+    if not args.batch:
+        summary = compare_files(args.old, args.new, args.output, **options)
+        print(f"{args.output} — {format_summary(summary)}")
+        return 0
+
+    jobs = pd.read_csv(args.batch)
+    failed = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [
+            pool.submit(compare_files, job.old, job.new, job.output, **options)
+            for job in jobs.itertuples(index=False)
+        ]
+        for job, future in zip(jobs.itertuples(index=False), futures):
+            try:
+                print(f"{job.output} — {format_summary(future.result())}")
+            except Exception as e:
+                failed += 1
+                print(f"{job.output} — FAILED: {e}", file=sys.stderr)
+
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,135 @@
+"""
+Fixture file ingestion: xlsx, csv and parquet, reading only the columns
+the comparison needs.
+
+Parsed workbooks are cached as Parquet sidecars keyed by a hash of the
+file contents, so comparing the same export again skips xlsx parsing.
+Only the KEEP_SIDECARS most recently used sidecars are kept.
+"""
+import hashlib
+import importlib.util
+import io
+import os
+
+import pandas as pd
+
+CACHE_DIR = os.environ.get(
+    "FIXTURE_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".fixture_cache")
+)
+
+EXCEL_EXTS = (".xlsx", ".xlsm", ".xls")
+KEEP_SIDECARS = 50
+
+# calamine (Rust) parses xlsx several times faster than openpyxl
+EXCEL_ENGINE = "calamine" if importlib.util.find_spec("python_calamine") else None
+HAS_PARQUET = importlib.util.find_spec("pyarrow") is not None
+
+# ================= PARSING =================
+def _column_filter(columns):
+    if columns is None:
+        return None
+    wanted = set(columns)
+    return lambda c: c in wanted
+
+def parse_fixtures(data, ext, columns=None):
+    usecols = _column_filter(columns)
+    buffer = io.BytesIO(data)
+
+    if ext in EXCEL_EXTS:
+        return pd.read_excel(buffer, usecols=usecols, engine=EXCEL_ENGINE)
+    if ext == ".csv":
+        return pd.read_csv(buffer, usecols=usecols)
+    if ext == ".parquet":
+        if columns is None:
+            return pd.read_parquet(buffer)
+        # Only the wanted columns are decoded, in file order
+        import pyarrow.parquet as pq
+
+        wanted = set(columns)
+        names = [c for c in pq.read_schema(buffer).names if c in wanted]
+        buffer.seek(0)
+        return pd.read_parquet(buffer, columns=names)
+    raise ValueError(f"Unsupported fixture file type: {ext or 'no extension'}")
+
+# ================= PARQUET SIDECAR =================
+def _sidecar_path(data, columns, cache_dir):
+    h = hashlib.sha256(data)
+    h.update(repr(sorted(columns) if columns is not None else None).encode())
+    return os.path.join(cache_dir, h.hexdigest() + ".parquet")
+
+def _write_sidecar(df, path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+    except Exception:
+        # Mixed-type columns (e.g. real times next to text) cannot be stored;
+        # the file is simply parsed again next time
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        return
+    _prune_sidecars(os.path.dirname(path))
+
+def _prune_sidecars(cache_dir, keep=KEEP_SIDECARS):
+    """Drop all but the `keep` most recently used sidecars."""
+    try:
+        sidecars = [entry for entry in os.scandir(cache_dir) if entry.name.endswith(".parquet")]
+    except OSError:
+        return
+    if len(sidecars) <= keep:
+        return
+
+    def last_used(entry):
+        try:
+            return entry.stat().st_mtime
+        except OSError:
+            return 0
+
+    sidecars.sort(key=last_used, reverse=True)
+    for entry in sidecars[keep:]:
+        try:
+            os.remove(entry.path)
+        except OSError:
+            pass
+
+# ================= PUBLIC API =================
+def read_fixtures(source, columns=None, file_name=None, cache_dir=CACHE_DIR):
+    """
+    Read a fixture file from a path, bytes or a binary file object.
+
+    file_name supplies the extension when source is not a path. Pass
+    cache_dir=None to skip the Parquet sidecar cache.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        file_name = file_name or os.fspath(source)
+        with open(source, "rb") as f:
+            data = f.read()
+    elif isinstance(source, bytes):
+        data = source
+    else:
+        data = source.getvalue() if hasattr(source, "getvalue") else source.read()
+
+    ext = os.path.splitext(file_name or "")[1].lower()
+
+    if ext not in EXCEL_EXTS or not cache_dir or not HAS_PARQUET:
+        return parse_fixtures(data, ext, columns)
+
+    sidecar = _sidecar_path(data, columns, cache_dir)
+    if os.path.exists(sidecar):
+        try:
+            df = pd.read_parquet(sidecar)
+        except Exception:
+            os.remove(sidecar)
+        else:
+            # Marks the sidecar as recently used for _prune_sidecars()
+            try:
+                os.utime(sidecar)
+            except OSError:
+                pass
+            return df
+
+    df = parse_fixtures(data, ext, columns)
+    _write_sidecar(df, sidecar)
+    return df
@@ -0,0 +1,583 @@
+import math
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse.csgraph import connected_components
+
+from report import comparable
+from similarity import get_backend
+
+MATCH_THRESHOLD = 0.9
+QGRAM = 3
+# Slack on the float bound checks, so a backend whose ratio rounds a hair
+# differently from 2.0*M/T is never filtered out at exactly the threshold
+BOUND_EPS = 1e-9
+
+# ================= NORMALIZATION =================
+def normalize_desc(text):
+    if pd.isna(text):
+        return ""
+    return " ".join(text.lower().split())
+
+def similarity(a, b):
+    return SequenceMatcher(None, a, b).ratio()
+
+# ================= CANDIDATE BLOCKING =================
+# SequenceMatcher.ratio() is 2*M/T, where M is the size of a common
+# subsequence of both strings and T is their combined length. That gives
+# two lossless filters, so only pairs that could still reach the threshold
+# are ever scored:
+#   * length:  M <= min(la, lb)
+#   * characters: M <= size of the character multiset intersection
+#   * q-grams: T - 2*M bounds the edit distance, and strings within edit
+#     distance k share at least max(la, lb) - q + 1 - k*q q-grams.
+
+def qgram_tokens(text, q=QGRAM):
+    """Character q-grams of text, numbered per occurrence (multiset -> set)."""
+    seen = Counter()
+    tokens = []
+    for i in range(len(text) - q + 1):
+        gram = text[i:i + q]
+        seen[gram] += 1
+        tokens.append((gram, seen[gram]))
+    return tokens
+
+def length_can_match(la, lb, threshold):
+    if la + lb == 0:
+        return True
+    return 2.0 * min(la, lb) / (la + lb) >= threshold - BOUND_EPS
+
+def min_shared_qgrams(la, lb, threshold, q=QGRAM):
+    total = la + lb
+    max_edits = math.floor(total * (1 - threshold) + 1e-9)
+    return max(la, lb) - q + 1 - q * max_edits
+
+# ================= DESCRIPTION INDEX =================
+def build_desc_index(new_norm):
+    index = {
+        "descs": list(new_norm),
+        "exact": defaultdict(list),
+        "by_length": defaultdict(list),
+        "postings": {},
+        "tokens": [],
+        "chars": [],
+        "windows": {},
+    }
+    for j, desc in enumerate(index["descs"]):
+        index["exact"][desc].append(j)
+        index["by_length"][len(desc)].append(j)
+        tokens = qgram_tokens(desc)
+        index["tokens"].append(set(tokens))
+        index["chars"].append(Counter(desc))
+        postings = index["postings"].setdefault(len(desc), {})
+        for token in tokens:
+            postings.setdefault(token, []).append(j)
+    index["lengths"] = sorted(index["by_length"])
+    return index
+
+def iter_candidates(index, a, threshold, skip=None, score=similarity):
+    """
+    Yield (j, score) for every new description that could score >= threshold
+    against a, in file order. Rows with skip[j] set are passed over unscored.
+    score must be a pairwise backend's score (bounded by 2*LCS/(la+lb)).
+    """
+    la = len(a)
+    if la not in index["windows"]:
+        index["windows"][la] = [
+            lb for lb in index["lengths"] if length_can_match(la, lb, threshold)
+        ]
+    tokens = qgram_tokens(a)
+    token_set = set(tokens)
+    candidates = set()
+    seen = set()
+
+    for lb in index["windows"][la]:
+        need = min_shared_qgrams(la, lb, threshold)
+        if need <= 0:
+            candidates.update(index["by_length"][lb])
+            continue
+        # Prefix filter: a candidate sharing `need` tokens must share
+        # at least one of the len(tokens) - need + 1 rarest ones
+        postings = index["postings"][lb]
+        rarest = sorted(tokens, key=lambda t: (len(postings.get(t, ())), t))
+        for token in rarest[:len(tokens) - need + 1]:
+            for j in postings.get(token, ()):
+                if j in seen or (skip is not None and skip[j]):
+                    continue
+                seen.add(j)
+                if len(token_set & index["tokens"][j]) >= need:
+                    candidates.add(j)
+
+    chars = Counter(a)
+    for j in sorted(candidates):
+        if skip is not None and skip[j]:
+            continue
+        b = index["descs"][j]
+        if b == a:
+            yield j, 1.0
+        elif 2.0 * sum((chars & index["chars"][j]).values()) / (la + len(b)) >= threshold - BOUND_EPS:
+            yield j, score(a, b)
+
+# ================= FUZZY MATCHING =================
+def match_descriptions(old_norm, new_norm, threshold=MATCH_THRESHOLD, workers=1, backend=None):
+    """
+    Pair each old description with its best unmatched new description.
+
+    Same result as scoring every old row against every unmatched new row in
+    file order (first best score wins, kept if >= threshold), but candidates
+    are blocked by exact text, length and a q-gram inverted index first.
+    Returns (old_pos, new_pos) pairs, with None for the unmatched side.
+
+    With workers > 1, or a batch similarity backend, candidate pairs are
+    scored first and the pairing is read off the matrix (greedy_pairs()).
+    The parallel path keeps the exact-text shortcut: rows with an identical
+    copy left only get their exact columns, and the rare row whose copies
+    were all taken by fuzzy matches is scored when the pairing reaches it.
+    """
+    backend = get_backend(backend)
+    if not backend.pairwise:
+        scores = similarity_matrix(old_norm, new_norm, threshold, backend=backend)
+        return greedy_pairs(scores, threshold)
+
+    if workers > 1:
+        old_norm, new_norm = list(old_norm), list(new_norm)
+        exact_only = exact_copies_suffice(old_norm, new_norm)
+        scores = similarity_matrix(old_norm, new_norm, threshold, workers=workers, backend=backend,
+                                   exact_first=True)
+        index = None
+
+        def rescore(i, matched):
+            nonlocal index
+            if not exact_only[i]:
+                return ()
+            if index is None:
+                index = build_desc_index(new_norm)
+            return iter_candidates(index, old_norm[i], threshold, skip=matched, score=backend.score)
+
+        return greedy_pairs(scores, threshold, rescore)
+
+    index = build_desc_index(new_norm)
+    matched = [False] * len(index["descs"])
+    pairs = []
+
+    for i, a in enumerate(old_norm):
+        best_match = None
+        best_score = 0
+
+        # Identical text scores 1.0, so the first unmatched copy wins outright
+        for j in index["exact"].get(a, ()):
+            if not matched[j]:
+                best_match, best_score = j, 1.0
+                break
+
+        if best_match is None:
+            for j, score in iter_candidates(index, a, threshold, skip=matched, score=backend.score):
+                if score > best_score:
+                    best_score = score
+                    best_match = j
+
+        if best_match is not None and best_score >= threshold:
+            matched[best_match] = True
+            pairs.append((i, best_match))
+        else:
+            pairs.append((i, None))
+
+    for j in range(len(matched)):
+        if not matched[j]:
+            pairs.append((None, j))
+
+    return pairs
+
+# ================= SIMILARITY MATRIX =================
+# Scoring is split into (block, old-row chunk) tasks. Each task only reads
+# the new-description index of its block, so tasks can run in any process;
+# results are merged in task order and the matrix is identical to a serial
+# run. The indexes are built once in the parent and handed to the workers
+# through the pool initializer (inherited, not rebuilt, under fork).
+MIN_CHUNK = 256
+
+_worker_state = {}
+
+class _TakenBefore:
+    """iter_candidates() skip mask: new rows certainly taken before old row i."""
+
+    def __init__(self, taken_by, i):
+        self.taken_by = taken_by
+        self.i = i
+
+    def __getitem__(self, j):
+        return self.taken_by[j] < self.i
+
+def _init_worker(indexes, taken_by, threshold, backend):
+    _worker_state.clear()
+    _worker_state.update(indexes=indexes, taken_by=taken_by, threshold=threshold, backend=backend)
+
+def _score_rows(index, old_pos, old_descs, new_pos, threshold, backend, taken_by=None):
+    rows, cols, data = [], [], []
+    for i, a in zip(old_pos, old_descs):
+        skip = _TakenBefore(taken_by, i) if taken_by is not None else None
+        for j, score in iter_candidates(index, a, threshold, skip=skip, score=backend.score):
+            if score >= threshold:
+                rows.append(i)
+                cols.append(new_pos[j])
+                data.append(score)
+    return (
+        np.asarray(rows, dtype=np.int64),
+        np.asarray(cols, dtype=np.int64),
+        np.asarray(data, dtype=float),
+    )
+
+def _score_task(task):
+    block, new_pos, old_pos, old_descs = task
+    state = _worker_state
+    return _score_rows(state["indexes"][block], old_pos, old_descs, new_pos,
+                       state["threshold"], state["backend"], state["taken_by"][block])
+
+def exact_copies_suffice(old_descs, new_descs):
+    """
+    Per old row: whether an identical new description is still left for it
+    once each earlier identical old row has taken one. Fuzzy matches can
+    take copies too, which greedy_pairs()'s rescore callback covers.
+    """
+    copies = Counter(new_descs)
+    taken = Counter()
+    suffice = np.zeros(len(old_descs), dtype=bool)
+    for k, desc in enumerate(old_descs):
+        suffice[k] = taken[desc] < copies[desc]
+        taken[desc] += 1
+    return suffice
+
+def _exact_rows(old_norm, new_norm, old_pos, new_pos):
+    """
+    Exact-first split of one block: (exact entries for the rows whose copies
+    suffice, old positions left to fuzzy-score, taken_by).
+
+    taken_by[k] is the old row after which new_pos[k] is certainly matched:
+    the n-th old row with its text, n being its number of new copies. Each
+    of those rows took a copy or found none left, so later fuzzy rows can
+    skip it just as the serial matcher skips matched rows.
+    """
+    old_pos = np.asarray(old_pos, dtype=np.int64)
+    copies = defaultdict(list)
+    for j in new_pos:
+        copies[new_norm[j]].append(j)
+
+    suffice = exact_copies_suffice([old_norm[i] for i in old_pos], [new_norm[j] for j in new_pos])
+    rows, cols = [], []
+    last_taker = {}
+    seen = Counter()
+    for i, exact in zip(old_pos, suffice):
+        desc = old_norm[i]
+        if not exact:
+            continue
+        for j in copies[desc]:
+            rows.append(i)
+            cols.append(j)
+        seen[desc] += 1
+        if seen[desc] == len(copies[desc]):
+            last_taker[desc] = int(i)
+
+    no_row = len(old_norm)
+    taken_by = [last_taker.get(new_norm[j], no_row) for j in new_pos]
+    exact = (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64), np.ones(len(rows)))
+    return exact, old_pos[~suffice], taken_by
+
+def _score_blocks(old_norm, new_norm, old_blocks, new_blocks):
+    if old_blocks is None:
+        return [(range(len(old_norm)), np.arange(len(new_norm)))]
+
+    old_blocks = pd.Series(list(old_blocks))
+    new_blocks = pd.Series(list(new_blocks))
+    new_groups = new_blocks.groupby(new_blocks, sort=False, dropna=False).indices
+    return [
+        (old_pos, new_groups[key])
+        for key, old_pos in old_blocks.groupby(old_blocks, sort=False, dropna=False).indices.items()
+        if key in new_groups
+    ]
+
+def _batch_rows(backend, old_pos, old_descs, new_pos, new_descs, threshold):
+    block = backend.matrix(old_descs, new_descs, threshold).tocoo()
+    return old_pos[block.row], new_pos[block.col], block.data
+
+def similarity_matrix(old_norm, new_norm, threshold=MATCH_THRESHOLD, old_blocks=None, new_blocks=None,
+                      workers=1, backend=None, exact_first=False):
+    """
+    Sparse (old x new) CSR matrix holding every score >= threshold.
+
+    With old_blocks/new_blocks (e.g. Start Date per row), only pairs in the
+    same block are scored. workers > 1 fans pairwise scoring out to a
+    process pool; batch backends are vectorized and always run in-process.
+
+    exact_first (pairwise backends) gives rows for which
+    exact_copies_suffice() only their identical columns and fuzzy-scores
+    the rest. That is enough for greedy_pairs(), not for assignment.
+    """
+    backend = get_backend(backend)
+    old_norm = list(old_norm)
+    new_norm = list(new_norm)
+    blocks = _score_blocks(old_norm, new_norm, old_blocks, new_blocks)
+
+    exact_parts = []
+    taken_by = [None] * len(blocks)
+    if exact_first and backend.pairwise:
+        scored_blocks, taken_by = [], []
+        for old_pos, new_pos in blocks:
+            exact, old_left, block_taken_by = _exact_rows(old_norm, new_norm, old_pos, new_pos)
+            exact_parts.append(exact)
+            if len(old_left):
+                scored_blocks.append((old_left, new_pos))
+                taken_by.append(block_taken_by)
+        blocks = scored_blocks
+
+    if not backend.pairwise:
+        parts = [
+            _batch_rows(
+                backend, np.asarray(old_pos), [old_norm[i] for i in old_pos],
+                np.asarray(new_pos), [new_norm[j] for j in new_pos], threshold
+            )
+            for old_pos, new_pos in blocks
+        ]
+    elif workers > 1:
+        n_rows = sum(len(old_pos) for old_pos, _ in blocks)
+        chunk = max(MIN_CHUNK, math.ceil(n_rows / (workers * 4)))
+        tasks = [
+            (block, new_pos, old_pos[k:k + chunk], [old_norm[i] for i in old_pos[k:k + chunk]])
+            for block, (old_pos, new_pos) in enumerate(blocks)
+            for k in range(0, len(old_pos), chunk)
+        ]
+        indexes = {
+            block: build_desc_index(new_norm[j] for j in new_pos)
+            for block, (_, new_pos) in enumerate(blocks)
+        }
+        with ProcessPoolExecutor(
+            max_workers=max(1, min(workers, len(tasks))), initializer=_init_worker,
+            initargs=(indexes, taken_by, threshold, backend)
+        ) as pool:
+            parts = list(pool.map(_score_task, tasks))
+    else:
+        parts = [
+            _score_rows(
+                build_desc_index(new_norm[j] for j in new_pos),
+                old_pos, [old_norm[i] for i in old_pos], new_pos, threshold, backend, block_taken_by
+            )
+            for (old_pos, new_pos), block_taken_by in zip(blocks, taken_by)
+        ]
+
+    parts = exact_parts + parts
+    if parts:
+        rows, cols, data = (np.concatenate(arrays) for arrays in zip(*parts))
+    else:
+        rows = cols = np.empty(0, dtype=np.int64)
+        data = np.empty(0)
+
+    scores = sparse.csr_matrix((data, (rows, cols)), shape=(len(old_norm), len(new_norm)))
+    scores.sort_indices()
+    return scores
+
+def greedy_pairs(scores, threshold=MATCH_THRESHOLD, rescore=None):
+    """
+    match_descriptions() pairing computed from a similarity_matrix().
+
+    The matrix holds every pair that could be kept, so taking the first best
+    unmatched column per row reproduces the file-order greedy result.
+    rescore(i, matched), when given, supplies (j, score) candidates for a
+    row that found no unmatched column in the matrix (exact_first rows).
+    """
+    n_old, n_new = scores.shape
+    indptr, indices, data = scores.indptr, scores.indices, scores.data
+    matched = np.zeros(n_new, dtype=bool)
+    pairs = []
+
+    for i in range(n_old):
+        best_match = None
+        best_score = 0
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if not matched[j] and data[k] > best_score:
+                best_score = data[k]
+                best_match = int(j)
+
+        if best_match is None and rescore is not None:
+            for j, score in rescore(i, matched):
+                if score > best_score:
+                    best_score = score
+                    best_match = int(j)
+
+        if best_match is not None and best_score >= threshold:
+            matched[best_match] = True
+            pairs.append((i, best_match))
+        else:
+            pairs.append((i, None))
+
+    pairs.extend((None, int(j)) for j in np.flatnonzero(~matched))
+    return pairs
+
+# ================= ASSIGNMENT MATCHING =================
+def assign_descriptions(old_norm, new_norm, threshold=MATCH_THRESHOLD, old_blocks=None, new_blocks=None,
+                        workers=1, backend=None, old_keys=None, new_keys=None):
+    """
+    Maximum-weight one-to-one pairing over similarity_matrix().
+
+    Unlike match_descriptions() the result does not depend on row order.
+    Each connected component of the sparse score graph is solved on its own,
+    so only small dense sub-matrices are ever built. Returns pairs in the
+    same layout as match_descriptions().
+    old_keys/new_keys (canonical description keys) score 1.0 wherever they
+    agree within a block, like identical descriptions.
+    """
+    scores = similarity_matrix(old_norm, new_norm, threshold, old_blocks, new_blocks, workers, backend)
+    if old_keys is not None:
+        scores = scores.maximum(key_matrix(old_keys, new_keys, old_blocks, new_blocks)).tocsr()
+    n_old, n_new = scores.shape
+    match_of_old = np.full(n_old, -1, dtype=np.int64)
+
+    if scores.nnz:
+        graph = sparse.bmat([[None, scores], [scores.T, None]], format="csr")
+        _, labels = connected_components(graph, directed=False)
+        old_labels, new_labels = labels[:n_old], labels[n_old:]
+        old_groups = pd.Series(old_labels).groupby(old_labels).indices
+        new_groups = pd.Series(new_labels).groupby(new_labels).indices
+
+        for label in np.unique(old_labels[scores.nonzero()[0]]):
+            old_pos, new_pos = old_groups[label], new_groups[label]
+            if len(old_pos) == 1 and len(new_pos) == 1:
+                match_of_old[old_pos[0]] = new_pos[0]
+                continue
+            block = scores[old_pos][:, new_pos].toarray()
+            r, c = linear_sum_assignment(block, maximize=True)
+            keep = block[r, c] > 0
+            match_of_old[old_pos[r[keep]]] = new_pos[c[keep]]
+
+    matched = np.zeros(n_new, dtype=bool)
+    matched[match_of_old[match_of_old >= 0]] = True
+    pairs = [(i, int(j) if j >= 0 else None) for i, j in enumerate(match_of_old)]
+    pairs.extend((None, int(j)) for j in np.flatnonzero(~matched))
+    return pairs
+
+# ================= KEY JOIN =================
+def join_on_keys(old_norm, new_norm, old_keys=None, new_keys=None):
+    """
+    Exact joins run before any fuzzy scoring: identical descriptions first,
+    then identical canonical keys (aliases.description_key()) when given,
+    each taking the first unmatched new row in file order. Returns
+    {old_pos: new_pos}.
+    """
+    joined = {}
+    matched = set()
+    columns = [(old_norm, new_norm)]
+    if old_keys is not None:
+        columns.append((old_keys, new_keys))
+
+    for old_col, new_col in columns:
+        rows = defaultdict(list)
+        for j, value in enumerate(new_col):
+            if value and j not in matched:
+                rows[value].append(j)
+
+        for i, value in enumerate(old_col):
+            if i in joined or not rows.get(value):
+                continue
+            j = rows[value].pop(0)
+            joined[i] = j
+            matched.add(j)
+
+    return joined
+
+def key_matrix(old_keys, new_keys, old_blocks=None, new_blocks=None):
+    """Sparse (old x new) matrix of 1.0 where the keys, and the blocks if given, agree."""
+    old_keys, new_keys = list(old_keys), list(new_keys)
+    old_blocks = [None] * len(old_keys) if old_blocks is None else list(old_blocks)
+    new_blocks = [None] * len(new_keys) if new_blocks is None else list(new_blocks)
+
+    columns = defaultdict(list)
+    for j, (key, block) in enumerate(zip(new_keys, new_blocks)):
+        if key:
+            columns[key, block].append(j)
+
+    rows, cols = [], []
+    for i, (key, block) in enumerate(zip(old_keys, old_blocks)):
+        if key:
+            matches = columns.get((key, block), ())
+            rows.extend([i] * len(matches))
+            cols.extend(matches)
+
+    return sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(len(old_keys), len(new_keys))
+    )
+
+def default_threshold(backend=None):
+    """Calibrated match threshold of a similarity backend (see similarity.py)."""
+    threshold = get_backend(backend).threshold
+    return MATCH_THRESHOLD if threshold is None else threshold
+
+def match_fixtures(old_df, new_df, threshold=None, mode="greedy", block_by_date=False,
+                   workers=1, backend=None, key_col=None):
+    """
+    Pair rows of old_df and new_df on Desc_norm, returning index labels.
+
+    mode="greedy" keeps the original file-order pairing; mode="assignment"
+    uses the order-independent assign_descriptions(). block_by_date only
+    applies to assignment mode and restricts pairs to the same Start Date,
+    compared on report.comparable()'s canonical key so a real date and
+    its text form share a block.
+    workers sets the number of scoring processes; results do not depend on it.
+    backend names a similarity.BACKENDS entry (default difflib); threshold
+    defaults to that backend's default_threshold().
+    In greedy mode identical descriptions are joined first, then rows with
+    the same key_col (a canonical description key, see aliases.py) when
+    given, and only the leftovers are fuzzy matched. A batch backend may
+    score a different description as high as an identical one, so the
+    identical copy must not be left for later rows. In assignment mode
+    agreeing keys score 1.0 in the assignment, within the date blocks when
+    block_by_date is set.
+    """
+    if mode not in ("greedy", "assignment"):
+        raise ValueError(f"Unknown matching mode: {mode}")
+    if threshold is None:
+        threshold = default_threshold(backend)
+
+    joined = {}
+    if mode == "greedy":
+        keys = (None, None)
+        if key_col is not None:
+            keys = (old_df[key_col].tolist(), new_df[key_col].tolist())
+        joined = join_on_keys(old_df["Desc_norm"].tolist(), new_df["Desc_norm"].tolist(), *keys)
+    old_left = np.setdiff1d(np.arange(len(old_df)), list(joined))
+    new_left = np.setdiff1d(np.arange(len(new_df)), list(joined.values()))
+    old_rest, new_rest = old_df.iloc[old_left], new_df.iloc[new_left]
+
+    if mode == "greedy":
+        rest = match_descriptions(old_rest["Desc_norm"], new_rest["Desc_norm"], threshold, workers, backend)
+    else:
+        blocks = (None, None)
+        if block_by_date:
+            blocks = (comparable(old_rest["Start Date"], "Start Date"),
+                      comparable(new_rest["Start Date"], "Start Date"))
+        keys = (None, None)
+        if key_col is not None:
+            keys = (old_rest[key_col], new_rest[key_col])
+        rest = assign_descriptions(
+            old_rest["Desc_norm"], new_rest["Desc_norm"], threshold, *blocks, workers, backend, *keys
+        )
+
+    # Map leftover positions back and merge with the joined rows in file order
+    match_of_old = dict(joined)
+    unmatched_new = []
+    for i, j in rest:
+        if i is None:
+            unmatched_new.append(int(new_left[j]))
+        elif j is not None:
+            match_of_old[int(old_left[i])] = int(new_left[j])
+
+    old_idx, new_idx = old_df.index, new_df.index
+    pairs = [
+        (old_idx[i], new_idx[match_of_old[i]] if i in match_of_old else None)
+        for i in range(len(old_df))
+    ]
+    pairs.extend((None, new_idx[j]) for j in sorted(unmatched_new))
+    return pairs
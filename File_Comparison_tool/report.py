@@ -0,0 +1,203 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+import xlsxwriter
+from xlsxwriter.utility import xl_col_to_name
+
+COMPARE_COLS = ["Description", "Start Date", "Start Time", "Venue"]
+
+REPORT_COLS = [
+    "Change Type",
+    "Description_OLD",
+    "Description_NEW",
+    "Start Date_OLD",
+    "Start Time_OLD",
+    "Venue_OLD",
+    "Start Date_NEW",
+    "Start Time_NEW",
+    "Venue_NEW",
+]
+
+# ================= VALUE NORMALIZATION =================
+# The two workbooks rarely agree on dtypes: one may hold real dates/times,
+# the other "01/15/2026" / "11:00:00 PM" strings. Values are compared on a
+# canonical key so those differences are not reported as changes.
+
+def _time_text(value):
+    if isinstance(value, datetime.time):
+        return value.strftime("%H:%M:%S")
+    if isinstance(value, (datetime.datetime, pd.Timestamp)):
+        return value.strftime("%H:%M:%S")
+    if isinstance(value, (datetime.timedelta, pd.Timedelta)):
+        return str(pd.Timestamp(0) + value)[11:19]
+    return value
+
+# Excel stores dates as days since 1899-12-30 and times as fractions of a day
+EXCEL_EPOCH = "1899-12-30"
+EXCEL_MAX_SERIAL = 2958465  # 9999-12-31
+
+def _is_number(value):
+    return isinstance(value, (int, float, np.number)) and not isinstance(value, (bool, np.bool_))
+
+def _number_text(value):
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+def _number_keys(uniques, col):
+    """(parsed, fallback) for numeric cells; they never go through pd.to_datetime's epoch-ns reading."""
+    numbers = pd.to_numeric(uniques, errors="coerce")
+    if col == "Start Date":
+        serial = numbers.between(1, EXCEL_MAX_SERIAL)
+        parsed = pd.to_datetime(numbers.where(serial).floordiv(1), unit="D", origin=EXCEL_EPOCH)
+        # 20260105 style numbers, as CSV readers produce them
+        yyyymmdd = pd.to_datetime(numbers.where(~serial).map(_number_text, na_action="ignore"),
+                                  errors="coerce", format="%Y%m%d")
+        parsed = parsed.fillna(yyyymmdd)
+    else:
+        fraction = numbers.between(0, 1, inclusive="left")
+        seconds = (numbers.where(fraction) * 86400).round()
+        parsed = pd.Timestamp(0) + pd.to_timedelta(seconds, unit="s")
+    return parsed, numbers.map(_number_text)
+
+def comparable(series, col):
+    """
+    Canonical comparison key for a column; unparseable values stay as text.
+
+    Numeric Start Dates are Excel serials (or yyyymmdd numbers) and numeric
+    Start Times are fractions of a day; other numbers keep their own key.
+
+    >>> comparable(pd.Series([46027, 20260112, "01/05/2026", "TBD"]), "Start Date").tolist()
+    ['2026-01-05', '2026-01-12', '2026-01-05', 'TBD']
+    >>> comparable(pd.Series([0.75, 0.5, "6:00 PM", 1900]), "Start Time").tolist()
+    ['18:00:00', '12:00:00', '18:00:00', '1900']
+    """
+    if col not in ("Start Date", "Start Time"):
+        return series.astype("object")
+
+    # Parse each distinct value once; fixture files repeat dates and times a lot
+    codes, uniques = pd.factorize(series)
+    uniques = pd.Series(uniques, dtype="object")
+    numeric = uniques.map(_is_number).astype(bool)
+
+    if col == "Start Date":
+        parsed = pd.to_datetime(uniques.where(~numeric), errors="coerce", format="mixed")
+        fmt = "%Y-%m-%d"
+    else:
+        text = uniques.where(~numeric).map(_time_text, na_action="ignore")
+        parsed = pd.to_datetime(text, errors="coerce", format="mixed")
+        fmt = "%H:%M:%S"
+
+    fallback = uniques
+    if numeric.any():
+        number_parsed, number_text = _number_keys(uniques.where(numeric), col)
+        parsed = parsed.where(~numeric, number_parsed)
+        fallback = uniques.where(~numeric, number_text)
+
+    key = parsed.dt.strftime(fmt).astype("object").where(parsed.notna(), fallback).to_numpy()
+    # factorize() codes missing values as -1, which picks the trailing None
+    key = np.append(key, None)
+    return pd.Series(key[codes], index=series.index, dtype="object")
+
+def values_equal(old, new, col):
+    """Element-wise equality where NaN == NaN and dtype differences are ignored."""
+    old_key = comparable(old, col)
+    new_key = comparable(new, col)
+    both_missing = old_key.isna().to_numpy() & new_key.isna().to_numpy()
+    same = (old_key.to_numpy() == new_key.to_numpy()) & old_key.notna().to_numpy()
+    return both_missing | same
+
+# ================= BUILD COMPARISON =================
+def _aligned(df, labels):
+    """Rows of df in pair order, plus a mask of which pairs had a row at all."""
+    present = np.array([label is not None for label in labels], dtype=bool)
+    positions = df.index.get_indexer([label for label in labels if label is not None])
+    take = np.zeros(len(labels), dtype=np.int64)
+    take[present] = positions
+    aligned = df[COMPARE_COLS].iloc[take].reset_index(drop=True)
+    return aligned, present
+
+def build_comparison(old_df, new_df, pairs):
+    """
+    Turn (old_label, new_label) pairs into the comparison report frame.
+
+    Both sides are aligned into one frame and compared column by column, so
+    the work is a handful of array operations regardless of report size.
+    """
+    old, has_old = _aligned(old_df, [i for i, _ in pairs])
+    new, has_new = _aligned(new_df, [j for _, j in pairs])
+
+    changes = pd.Series("", index=old.index, dtype="object")
+    for col in COMPARE_COLS:
+        differs = ~values_equal(old[col], new[col], col)
+        changes = changes + np.where(differs, col + ", ", "")
+    changes = changes.str[:-2]
+
+    change_type = np.select(
+        [~has_old, ~has_new, changes != ""],
+        ["ADDED", "REMOVED", "MODIFIED (" + changes + ")"],
+        "NO CHANGE",
+    )
+
+    final_df = pd.DataFrame({"Change Type": change_type})
+    for col in COMPARE_COLS:
+        final_df[col + "_OLD"] = old[col].astype("object").where(has_old, "")
+        final_df[col + "_NEW"] = new[col].astype("object").where(has_new, "")
+
+    return final_df[REPORT_COLS]
+
+# ================= EXPORT TO EXCEL =================
+FILL_COLORS = {
+    "ADDED": "#C6EFCE",
+    "REMOVED": "#FFC7CE",
+    "MODIFIED": "#FFEB9C",
+}
+
+def _excel_column(series):
+    """Column values ready for write_row(), with blanks as None."""
+    return series.astype("object").where(series.notna(), None).tolist()
+
+def export_report(final_df, output):
+    """
+    Write the report to a path or binary buffer in a single streaming pass.
+
+    Rows are flushed as they are written (constant_memory) and the
+    ADDED/REMOVED/MODIFIED fills are three conditional-format rules keyed on
+    the Change Type column, so no cell is ever styled individually.
+    """
+    wb = xlsxwriter.Workbook(output, {
+        "constant_memory": True,
+        "default_date_format": "yyyy-mm-dd hh:mm:ss",
+    })
+    ws = wb.add_worksheet("Sheet1")
+
+    header_fmt = wb.add_format({"bold": True, "border": 1, "align": "center"})
+    time_fmt = wb.add_format({"num_format": "hh:mm:ss"})
+    ws.write_row(0, 0, list(final_df.columns), header_fmt)
+
+    columns = [_excel_column(final_df[col]) for col in final_df.columns]
+    # Only columns that hold real times need per-cell formats; write_row()
+    # would give a datetime.time the default date-time format
+    time_cols = [c for c, values in enumerate(columns)
+                 if any(isinstance(v, datetime.time) for v in values)]
+    for r, row in enumerate(zip(*columns), start=1):
+        ws.write_row(r, 0, row)
+        for c in time_cols:
+            if isinstance(row[c], datetime.time):
+                ws.write_datetime(r, c, row[c], time_fmt)
+
+    n_rows, n_cols = final_df.shape
+    if n_rows:
+        change_col = xl_col_to_name(final_df.columns.get_loc("Change Type"))
+        rules = {
+            "ADDED": f'=${change_col}2="ADDED"',
+            "REMOVED": f'=${change_col}2="REMOVED"',
+            "MODIFIED": f'=LEFT(${change_col}2,8)="MODIFIED"',
+        }
+        for change, criteria in rules.items():
+            ws.conditional_format(1, 0, n_rows, n_cols - 1, {
+                "type": "formula",
+                "criteria": criteria,
+                "format": wb.add_format({"bg_color": FILL_COLORS[change]}),
+            })
+
+    wb.close()
@@ -0,0 +1,184 @@
+"""
+String-similarity backends for fixture description matching.
+
+Every backend scores on a 0..1 scale, but the scales are not the same:
+one typo costs difflib a few hundredths and a character n-gram cosine
+around a fifth. A backend's `threshold` is its calibrated default, the
+cut that best separates one- and two-character typos from other
+fixtures in `python benchmark.py --calibrate`. The edit-distance backends
+leave it as None and keep MATCH_THRESHOLD, the reference behaviour.
+
+Batch backends score 0 for descriptions whose words are a proper subset
+of the other's ("Iowa v UNC" / "Iowa State v UNC"). token_set rates such
+pairs 1.0 and the n-gram cosine above most typos, yet they are usually
+different teams; aliases.py refuses to learn them for the same reason.
+
+* "Pairwise" backends score one pair at a time and never exceed
+  2*LCS/(la+lb); the lossless candidate blocking in matching.py applies
+  to them (difflib, rapidfuzz).
+* Batch backends build the whole sparse score matrix themselves, in
+  chunks of old rows (token_set, tfidf).
+"""
+import importlib.util
+from difflib import SequenceMatcher
+
+import numpy as np
+from scipy import sparse
+
+CHUNK_ROWS = 256
+
+def _installed(module):
+    return importlib.util.find_spec(module) is not None
+
+def word_subset(a_words, b_words):
+    """True when one word set is a proper subset of the other."""
+    return a_words != b_words and (a_words <= b_words or b_words <= a_words)
+
+def _words(texts):
+    return [frozenset(text.split()) for text in texts]
+
+def _sparse_from_chunks(chunks, shape, old_words, new_words):
+    """Stack (first_row, score block) chunks into one CSR matrix, without word-subset pairs."""
+    rows, cols, data = [], [], []
+    for start, block in chunks:
+        block = sparse.coo_matrix(block)
+        keep = np.array([
+            not word_subset(old_words[start + i], new_words[j]) for i, j in zip(block.row, block.col)
+        ], dtype=bool)
+        rows.append(block.row[keep] + start)
+        cols.append(block.col[keep])
+        data.append(block.data[keep])
+
+    if not rows:
+        return sparse.csr_matrix(shape)
+    scores = sparse.csr_matrix(
+        (np.concatenate(data), (np.concatenate(rows), np.concatenate(cols))),
+        shape=shape,
+    )
+    scores.sort_indices()
+    return scores
+
+# ================= BACKENDS =================
+class SimilarityBackend:
+    name = ""
+    label = ""
+    pairwise = True
+    requires = None
+    threshold = None
+
+    def available(self):
+        return self.requires is None or _installed(self.requires)
+
+    def score(self, a, b):
+        raise NotImplementedError
+
+    def matrix(self, old_norm, new_norm, threshold):
+        """Sparse (old x new) matrix of scores >= threshold (batch backends)."""
+        raise NotImplementedError
+
+class DifflibBackend(SimilarityBackend):
+    name = "difflib"
+    label = "difflib SequenceMatcher (reference)"
+
+    def score(self, a, b):
+        return SequenceMatcher(None, a, b).ratio()
+
+class RapidfuzzBackend(SimilarityBackend):
+    name = "rapidfuzz"
+    label = "rapidfuzz Indel ratio (C++)"
+    requires = "rapidfuzz"
+
+    def score(self, a, b):
+        from rapidfuzz.distance import Indel
+        return Indel.normalized_similarity(a, b)
+
+class TokenSetBackend(SimilarityBackend):
+    name = "token_set"
+    label = "rapidfuzz token-set ratio (word order)"
+    pairwise = False
+    requires = "rapidfuzz"
+    threshold = 0.9
+
+    def score(self, a, b):
+        from rapidfuzz import fuzz
+        if word_subset(frozenset(a.split()), frozenset(b.split())):
+            return 0.0
+        return fuzz.token_set_ratio(a, b) / 100
+
+    def matrix(self, old_norm, new_norm, threshold):
+        from rapidfuzz import fuzz, process
+
+        def chunks():
+            for start in range(0, len(old_norm), CHUNK_ROWS):
+                block = process.cdist(
+                    old_norm[start:start + CHUNK_ROWS], new_norm,
+                    scorer=fuzz.token_set_ratio,
+                    score_cutoff=threshold * 100,
+                    dtype=np.float64,
+                    workers=-1,
+                ) / 100
+                block[block < threshold] = 0
+                yield start, block
+
+        return _sparse_from_chunks(
+            chunks(), (len(old_norm), len(new_norm)), _words(old_norm), _words(new_norm)
+        )
+
+class TfidfBackend(SimilarityBackend):
+    name = "tfidf"
+    label = "character n-gram TF cosine (batch)"
+    pairwise = False
+    requires = "sklearn"
+    threshold = 0.75
+
+    def _vectorizer(self, texts):
+        # Term frequencies only: IDF weights depend on the whole corpus, so
+        # score(a, b) could never equal the same pair's matrix() entry
+        from sklearn.feature_extraction.text import TfidfVectorizer
+        return TfidfVectorizer(analyzer="char_wb", ngram_range=(2, 3), use_idf=False).fit(texts)
+
+    def score(self, a, b):
+        if word_subset(frozenset(a.split()), frozenset(b.split())):
+            return 0.0
+        vectors = self._vectorizer([a, b]).transform([a, b])
+        return float((vectors[0] @ vectors[1].T).toarray()[0, 0])
+
+    def matrix(self, old_norm, new_norm, threshold):
+        if not old_norm or not new_norm:
+            return sparse.csr_matrix((len(old_norm), len(new_norm)))
+
+        vectorizer = self._vectorizer(old_norm + new_norm)
+        old_vec = vectorizer.transform(old_norm)
+        new_vec_t = vectorizer.transform(new_norm).T.tocsr()
+
+        def chunks():
+            for start in range(0, len(old_norm), CHUNK_ROWS):
+                block = (old_vec[start:start + CHUNK_ROWS] @ new_vec_t).tocsr()
+                block.data[block.data < threshold] = 0
+                block.eliminate_zeros()
+                yield start, block
+
+        return _sparse_from_chunks(
+            chunks(), (len(old_norm), len(new_norm)), _words(old_norm), _words(new_norm)
+        )
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (DifflibBackend(), RapidfuzzBackend(), TokenSetBackend(), TfidfBackend())
+}
+
+DEFAULT_BACKEND = "difflib"
+
+def available_backends():
+    return [name for name, backend in BACKENDS.items() if backend.available()]
+
+def get_backend(backend=None):
+    if backend is None:
+        backend = DEFAULT_BACKEND
+    if isinstance(backend, SimilarityBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown similarity backend: {backend}")
+    if not BACKENDS[backend].available():
+        raise ValueError(f"Similarity backend '{backend}' needs {BACKENDS[backend].requires} installed")
+    return BACKENDS[backend]
@@ -1,91 +1,49 @@
 import streamlit as st
 import pandas as pd
-import pickle
 import os
-import requests
-from sklearn.preprocessing import StandardScaler
-from sklearn.tree import DecisionTreeClassifier
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.svm import SVC
-from sklearn.model_selection import train_test_split
+import time
+
+from features import all_pair_features, build_feature_index, matchup_feature
+from model_store import MODEL_STORE, data_hash
+from refresh import fetch_results, refresh_status, save_results, start_refresh
+from training import report_table, train_bundle
 
 # ---------------------------------
 # Streamlit Page Config
 # ---------------------------------
 st.set_page_config(page_title="Premiership Rugby 2025 Predictor", layout="centered")
 st.title("Premiership Rugby 2025 — Match Predictor")
-st.markdown("Predict the winner using **Decision Tree**, **Random Forest**, and **SVC** models.")
+st.markdown("Predict the winner using **Decision Tree**, **Random Forest**, and a **linear model** (SGD).")
 
 # ---------------------------------
 # Step 0: Ensure CSV exists
 # ---------------------------------
 CSV_FILE = "rugby_data_report.csv"
-MODEL_FILES = ["DecisionTree_model.pkl", "RandomForest_model.pkl", "SVC_model.pkl", "scaler.pkl"]
 
 def fetch_and_prepare_data():
     """Fetch live JSON and create the processed CSV."""
     st.info("Fetching Premiership Rugby 2025 data from live feed...")
-    url = "https://fixturedownload.com/feed/json/premiership-rugby-2025"
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        df = fetch_results()
     except Exception as e:
         st.error(f"Failed to fetch live data: {e}")
         st.stop()
 
-    df = pd.DataFrame(data)
-    df = df.dropna(subset=["HomeTeamScore", "AwayTeamScore"])
-    df = df[df["HomeTeamScore"] != ""]
-    df = df[df["AwayTeamScore"] != ""]
-    df = df[["HomeTeam", "AwayTeam", "HomeTeamScore", "AwayTeamScore"]]
-    df = df.rename(columns={
-        "HomeTeam": "Team_A",
-        "AwayTeam": "Team_B",
-        "HomeTeamScore": "Score_A",
-        "AwayTeamScore": "Score_B"
-    })
-    df["Score_A"] = df["Score_A"].astype(int)
-    df["Score_B"] = df["Score_B"].astype(int)
-    df["Score_diff"] = df["Score_A"] - df["Score_B"]
-    df["Winner_flag"] = (df["Score_A"] > df["Score_B"]).astype(int)
-    df.to_csv(CSV_FILE, index=False)
+    save_results(df, CSV_FILE)
     st.success("Data fetched and CSV created successfully!")
     return df
 
 # ---------------------------------
 # Step 1: Train models if missing
 # ---------------------------------
-def train_and_save_models(df):
-    X = df[["Score_diff"]]
-    y = df["Winner_flag"]
-
-    scaler = StandardScaler()
-    X_scaled = scaler.fit_transform(X)
-
-    X_train, X_test, y_train, y_test = train_test_split(X_scaled, y, test_size=0.2, random_state=42)
-
-    dt_model = DecisionTreeClassifier(max_depth=3, random_state=42)
-    dt_model.fit(X_train, y_train)
+def train_and_save_models(df, key):
+    bundle, report = train_bundle(df)
 
-    rf_model = RandomForestClassifier(n_estimators=100, random_state=42)
-    rf_model.fit(X_train, y_train)
-
-    svc_model = SVC(kernel='linear', probability=True, random_state=42)
-    svc_model.fit(X_train, y_train)
-
-    # Save models and scaler
-    with open("DecisionTree_model.pkl", "wb") as f:
-        pickle.dump(dt_model, f)
-    with open("RandomForest_model.pkl", "wb") as f:
-        pickle.dump(rf_model, f)
-    with open("SVC_model.pkl", "wb") as f:
-        pickle.dump(svc_model, f)
-    with open("scaler.pkl", "wb") as f:
-        pickle.dump(scaler, f)
+    # Save models and scaler as one versioned bundle
+    MODEL_STORE.save(key, bundle, data=data_hash(df), rows=len(df), mode="full", report=report)
 
     st.success("Models trained and saved successfully!")
-    return dt_model, rf_model, svc_model, scaler
+    return bundle
 
 # ---------------------------------
 # Step 2: Load data and models
@@ -98,23 +56,50 @@ def load_data_and_models():
     else:
         df = pd.read_csv(CSV_FILE)
 
-    # Models
-    missing_models = any(not os.path.exists(f) for f in MODEL_FILES)
-    if missing_models:
-        dt_model, rf_model, svc_model, scaler = train_and_save_models(df)
+    # Models: only a bundle trained on exactly this data is served
+    key = MODEL_STORE.artifact_key(df)
+    status = MODEL_STORE.status(key)
+    if status == "current":
+        bundle = MODEL_STORE.load(key)
     else:
-        with open("DecisionTree_model.pkl", "rb") as f:
-            dt_model = pickle.load(f)
-        with open("RandomForest_model.pkl", "rb") as f:
-            rf_model = pickle.load(f)
-        with open("SVC_model.pkl", "rb") as f:
-            svc_model = pickle.load(f)
-        with open("scaler.pkl", "rb") as f:
-            scaler = pickle.load(f)
+        if status == "stale":
+            st.warning("Saved models were trained on different data or another scikit-learn version — retraining.")
+        bundle = train_and_save_models(df, key)
+    dt_model, rf_model, linear_model, scaler = bundle["dt"], bundle["rf"], bundle["linear"], bundle["scaler"]
+
+    # Team aggregates and head-to-head table, built once per load
+    feature_index = build_feature_index(df)
 
-    return df, dt_model, rf_model, svc_model, scaler
+    return df, dt_model, rf_model, linear_model, scaler, feature_index, key
 
-df, dt_model, rf_model, svc_model, scaler = load_data_and_models()
+df, dt_model, rf_model, linear_model, scaler, feature_index, model_key = load_data_and_models()
+
+# ---------------------------------
+# Step 2b: Background results refresh
+# ---------------------------------
+@st.fragment(run_every=2)
+def refresh_panel():
+    refresh = refresh_status()
+    if st.button("Fetch new results", disabled=refresh["status"] == "running"):
+        start_refresh(CSV_FILE)
+        refresh = refresh_status()
+
+    if refresh["status"] == "running":
+        st.info(f"Refreshing… {time.time() - refresh['started']:.0f}s — predictions use the current models meanwhile.")
+    elif refresh["status"] == "failed":
+        st.error(f"Refresh failed: {refresh['error']}")
+    elif refresh["status"] == "done":
+        result = refresh["result"]
+        st.caption(f"{result['added']} new match(es), {result['rows']} in total ({result['seconds']}s).")
+        # Pick up the new data and models once per finished refresh
+        if result["mode"] and st.session_state.get("refresh_loaded") != refresh["started"]:
+            st.session_state["refresh_loaded"] = refresh["started"]
+            load_data_and_models.clear()
+            st.rerun()
+
+with st.sidebar:
+    st.subheader("Results Data")
+    refresh_panel()
 
 # ---------------------------------
 # Step 3: Show dataset
@@ -122,7 +107,68 @@ df, dt_model, rf_model, svc_model, scaler = load_data_and_models()
 with st.expander("View Processed Data"):
     st.dataframe(df)
 
-teams = sorted(set(df["Team_A"]).union(df["Team_B"]))
+with st.expander("View Team Averages"):
+    st.dataframe(feature_index["team_table"])
+
+with st.expander("Model Training Report"):
+    model_meta = MODEL_STORE.meta(model_key) or {}
+    model_report = MODEL_STORE.report(model_key)
+    st.caption(f"Bundle {model_key} — {model_meta.get('mode', 'unknown')} training on {model_meta.get('rows')} matches.")
+    if model_report:
+        st.dataframe(report_table(model_report))
+        st.caption(f"Total {model_report['seconds']}s"
+                   + (f", search over {model_report['candidates']} candidates in {model_report['search_seconds']}s"
+                      if model_report["search"] else ""))
+    else:
+        st.write("No training report for this bundle (warm-updated models keep their base's hyperparameters).")
+
+teams = feature_index["teams"]
+
+# ---------------------------------
+# Step 3b: All-pairs prediction matrix
+# ---------------------------------
+MODEL_NAMES = ["Decision Tree", "Random Forest", "Linear (SGD)"]
+
+def predict_all_pairs(feature_index, models, scaler, teams=None):
+    """Home-win probability of every model for every ordered pair, in one batch."""
+    pairs = all_pair_features(feature_index, teams)
+    X_all = scaler.transform(pairs[["Score_diff"]])
+    for name, model in models.items():
+        home_win = list(model.classes_).index(1)
+        pairs[f"{name} P(home win)"] = model.predict_proba(X_all)[:, home_win]
+    return pairs
+
+with st.expander("All-Pairs Win Probabilities"):
+    matrix_teams = st.multiselect("Teams", teams, default=teams)
+    if st.button("Predict every pairing", disabled=len(matrix_teams) < 2):
+        st.session_state["all_pairs"] = predict_all_pairs(
+            feature_index,
+            dict(zip(MODEL_NAMES, (dt_model, rf_model, linear_model))),
+            scaler,
+            matrix_teams,
+        )
+
+    all_pairs = st.session_state.get("all_pairs")
+    if all_pairs is not None:
+        matrix_model = st.radio("Model", MODEL_NAMES, horizontal=True)
+        matrix = all_pairs.pivot(index="Team_A", columns="Team_B", values=f"{matrix_model} P(home win)")
+        matrix = matrix.rename_axis(index="Home", columns="Away")
+        st.caption(f"{len(all_pairs)} pairings — rows are the home side, values are its win probability.")
+        st.dataframe(matrix.style.format("{:.2f}", na_rep=""))
+
+        col1, col2 = st.columns(2)
+        col1.download_button(
+            f"Download {matrix_model} matrix (CSV)",
+            matrix.to_csv().encode("utf-8"),
+            file_name=f"win_probabilities_{matrix_model.replace(' ', '_')}.csv",
+            mime="text/csv",
+        )
+        col2.download_button(
+            "Download all pairings (CSV)",
+            all_pairs.to_csv(index=False).encode("utf-8"),
+            file_name="win_probabilities_all_pairs.csv",
+            mime="text/csv",
+        )
 
 # ---------------------------------
 # Step 4: Match Prediction UI
@@ -139,19 +185,7 @@ if team_a == team_b:
 # ---------------------------------
 # Step 5: Feature Engineering
 # ---------------------------------
-team_matches = df[((df["Team_A"] == team_a) & (df["Team_B"] == team_b)) |
-                  ((df["Team_A"] == team_b) & (df["Team_B"] == team_a))]
-
-if team_matches.empty:
-    team_a_avg = df[df["Team_A"] == team_a]["Score_diff"].mean()
-    team_b_avg = df[df["Team_A"] == team_b]["Score_diff"].mean()
-    avg_diff = 0 if pd.isna(team_a_avg) or pd.isna(team_b_avg) else (team_a_avg - team_b_avg)/2
-    note = "No direct match data — using average team performance."
-else:
-    team_a_diff = team_matches.loc[team_matches["Team_A"] == team_a, "Score_diff"].mean()
-    team_b_diff = -(team_matches.loc[team_matches["Team_A"] == team_b, "Score_diff"]).mean()
-    avg_diff = (team_a_diff if pd.notna(team_a_diff) else 0) + (team_b_diff if pd.notna(team_b_diff) else 0)
-    note = "Prediction based on past head-to-head data."
+avg_diff, note = matchup_feature(feature_index, team_a, team_b)
 
 X_sample = pd.DataFrame({"Score_diff": [avg_diff]})
 X_scaled = scaler.transform(X_sample)
@@ -159,11 +193,7 @@ X_scaled = scaler.transform(X_sample)
 # ---------------------------------
 # Step 6: Predictions
 # ---------------------------------
-models = {
-    "Decision Tree": dt_model,
-    "Random Forest": rf_model,
-    "SVC": svc_model
-}
+models = dict(zip(MODEL_NAMES, (dt_model, rf_model, linear_model)))
 
 predictions = {}
 for name, model in models.items():
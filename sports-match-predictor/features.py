@@ -0,0 +1,88 @@
+"""
+Precomputed matchup features for the predictor.
+
+build_feature_index aggregates the results once: per-team home and away
+score differences and a head-to-head table keyed by (home, away) pair.
+matchup_feature then answers any pairing with dictionary lookups instead
+of scanning the whole results frame, and all_pair_features computes the
+same feature for every ordered pairing at once.
+"""
+import numpy as np
+import pandas as pd
+
+H2H_NOTE = "Prediction based on past head-to-head data."
+AVERAGE_NOTE = "No direct match data — using average team performance."
+
+# ---------------------------------
+# Build the index
+# ---------------------------------
+def build_feature_index(df):
+    """Team aggregates and head-to-head means from a results frame (Team_A at home)."""
+    home = df.groupby("Team_A")["Score_diff"].agg(["mean", "count"])
+    away = df.groupby("Team_B")["Score_diff"].agg(["mean", "count"])
+    pairs = df.groupby(["Team_A", "Team_B"])["Score_diff"].mean()
+
+    teams = sorted(set(df["Team_A"]).union(df["Team_B"]))
+    team_table = pd.DataFrame({
+        "Home_games": home["count"],
+        "Home_avg_diff": home["mean"],
+        "Away_games": away["count"],
+        # Away sides' own point of view, so positive means they won on average
+        "Away_avg_diff": -away["mean"],
+    }).reindex(teams)
+    team_table["Home_games"] = team_table["Home_games"].fillna(0).astype(int)
+    team_table["Away_games"] = team_table["Away_games"].fillna(0).astype(int)
+
+    return {
+        "teams": teams,
+        "team_table": team_table,
+        "home_avg": home["mean"].to_dict(),
+        "head_to_head": pairs.to_dict(),
+        "pair_means": pairs,
+    }
+
+# ---------------------------------
+# Lookups
+# ---------------------------------
+def matchup_feature(index, team_a, team_b):
+    """Score_diff feature and explanation for team_a at home to team_b."""
+    h2h = index["head_to_head"]
+    a_home = h2h.get((team_a, team_b))
+    b_home = h2h.get((team_b, team_a))
+
+    if a_home is None and b_home is None:
+        team_a_avg = index["home_avg"].get(team_a)
+        team_b_avg = index["home_avg"].get(team_b)
+        if team_a_avg is None or team_b_avg is None:
+            return 0, AVERAGE_NOTE
+        return (team_a_avg - team_b_avg) / 2, AVERAGE_NOTE
+
+    avg_diff = (a_home if a_home is not None else 0) - (b_home if b_home is not None else 0)
+    return avg_diff, H2H_NOTE
+
+def all_pair_features(index, teams=None):
+    """
+    Score_diff feature for every ordered (home, away) pair of teams, one row
+    per pair. Same values as matchup_feature, computed as team x team arrays.
+    """
+    teams = list(index["teams"] if teams is None else teams)
+    home_vs = index["pair_means"].unstack().reindex(index=teams, columns=teams).to_numpy(dtype=float)
+    away_vs = home_vs.T
+
+    has_h2h = ~np.isnan(home_vs) | ~np.isnan(away_vs)
+    h2h_diff = np.nan_to_num(home_vs) - np.nan_to_num(away_vs)
+
+    home_avg = pd.Series(index["home_avg"], dtype=float).reindex(teams).to_numpy()
+    average_diff = np.nan_to_num((home_avg[:, None] - home_avg[None, :]) / 2)
+
+    feature = np.where(has_h2h, h2h_diff, average_diff)
+    home, away = np.meshgrid(np.arange(len(teams)), np.arange(len(teams)), indexing="ij")
+    off_diagonal = home != away
+
+    team_names = np.array(teams, dtype=object)
+    return pd.DataFrame({
+        "Team_A": team_names[home[off_diagonal]],
+        "Team_B": team_names[away[off_diagonal]],
+        "Score_diff": feature[off_diagonal],
+        "Head_to_head": has_h2h[off_diagonal],
+    })
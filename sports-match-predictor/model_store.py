@@ -0,0 +1,138 @@
+"""
+Versioned store of trained model bundles for the predictor.
+
+A bundle (scaler + Decision Tree + Random Forest + linear model) is saved
+as one uncompressed joblib file, which loads without a decompression pass:
+
+    models/<key>/bundle.joblib
+    models/<key>/meta.json      data hash, features, scikit-learn version, sizes
+    models/<key>/report.json    training timings and scores, when available
+    models/latest.json         key of the most recently saved bundle
+
+Bundles are not memory-mapped. scikit-learn copies every tree's node
+arrays into the tree object when it is unpickled, so only a few small
+arrays (scaler statistics, coefficients, classes_) could stay mapped.
+Each bundle is loaded once per process and kept in memory instead.
+
+The key is a hash of the training data, the feature columns, the bundle
+layout and the scikit-learn version. A bundle trained on other data,
+other features or another scikit-learn release therefore never matches
+the current key and is reported as stale instead of being served.
+"""
+import hashlib
+import json
+import os
+import shutil
+import threading
+import time
+
+import joblib
+import pandas as pd
+import sklearn
+
+MODEL_DIR = os.environ.get(
+    "PREDICTOR_MODEL_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "models")
+)
+FEATURES = ["Score_diff"]
+DATA_COLUMNS = ["Team_A", "Team_B", "Score_A", "Score_B"]
+KEEP_BUNDLES = 5
+# Bump when the models in a bundle change, so older bundles read as stale
+BUNDLE_VERSION = 2
+
+def data_hash(df):
+    """Content hash of the result rows the models are trained on."""
+    hashed = pd.util.hash_pandas_object(df[DATA_COLUMNS], index=False)
+    return hashlib.sha256(hashed.to_numpy().tobytes()).hexdigest()
+
+class ModelStore:
+    def __init__(self, path=MODEL_DIR):
+        self.path = path
+        self.lock = threading.Lock()
+        self._loaded = {}
+
+    def artifact_key(self, df, features=FEATURES):
+        text = json.dumps({
+            "data": data_hash(df),
+            "features": list(features),
+            "bundle": BUNDLE_VERSION,
+            "sklearn": sklearn.__version__,
+        }, sort_keys=True)
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+
+    def _bundle_dir(self, key):
+        return os.path.join(self.path, key)
+
+    def meta(self, key):
+        try:
+            with open(os.path.join(self._bundle_dir(key), "meta.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def report(self, key):
+        try:
+            with open(os.path.join(self._bundle_dir(key), "report.json"), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def latest(self):
+        """Metadata of the most recently saved bundle, or None."""
+        try:
+            with open(os.path.join(self.path, "latest.json"), encoding="utf-8") as f:
+                return self.meta(json.load(f)["key"])
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def status(self, key):
+        """"current" when a bundle for key exists, "stale" when only older bundles do, else "missing"."""
+        if self.meta(key) is not None:
+            return "current"
+        return "stale" if self.latest() is not None else "missing"
+
+    def save(self, key, bundle, features=FEATURES, report=None, **info):
+        """Write bundle (and its training report) under key atomically and mark it as the latest."""
+        final_dir = self._bundle_dir(key)
+        tmp_dir = f"{final_dir}.{os.getpid()}.{threading.get_ident()}.tmp"
+        os.makedirs(tmp_dir, exist_ok=True)
+
+        # Uncompressed: loading skips the decompression pass
+        joblib.dump(bundle, os.path.join(tmp_dir, "bundle.joblib"))
+        meta = {"key": key, "features": list(features), "sklearn": sklearn.__version__,
+                "created": time.time(), **info}
+        with open(os.path.join(tmp_dir, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        if report is not None:
+            with open(os.path.join(tmp_dir, "report.json"), "w", encoding="utf-8") as f:
+                json.dump(report, f)
+
+        with self.lock:
+            shutil.rmtree(final_dir, ignore_errors=True)
+            os.replace(tmp_dir, final_dir)
+            latest_path = os.path.join(self.path, "latest.json")
+            with open(f"{latest_path}.tmp", "w", encoding="utf-8") as f:
+                json.dump({"key": key}, f)
+            os.replace(f"{latest_path}.tmp", latest_path)
+            self._loaded[key] = bundle
+        self.prune()
+        return meta
+
+    def load(self, key):
+        """Bundle for key, loaded on first use and kept for later calls."""
+        with self.lock:
+            if key not in self._loaded:
+                path = os.path.join(self._bundle_dir(key), "bundle.joblib")
+                self._loaded[key] = joblib.load(path)
+            return self._loaded[key]
+
+    def prune(self, keep=KEEP_BUNDLES):
+        """Drop all but the newest `keep` bundles."""
+        keys = [key for key in os.listdir(self.path) if self.meta(key)]
+        keys.sort(key=lambda key: self.meta(key)["created"], reverse=True)
+        with self.lock:
+            for key in keys[keep:]:
+                shutil.rmtree(self._bundle_dir(key), ignore_errors=True)
+                self._loaded.pop(key, None)
+
+MODEL_STORE = ModelStore()
@@ -0,0 +1,131 @@
+"""
+Incremental results refresh for the predictor.
+
+refresh_results fetches the fixture feed, appends only matches that were
+completed since the last refresh (matched on MATCH_KEY) to the results CSV,
+and brings the models up to date with training.warm_update. It retrains
+from scratch only when there is no current bundle to start from.
+
+start_refresh runs it on a background thread of the Streamlit server, so
+the app keeps serving the previous models until the new bundle is saved.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import requests
+
+from model_store import MODEL_STORE, data_hash
+from training import train_bundle, warm_update
+
+FEED_URL = os.environ.get(
+    "PREDICTOR_FEED_URL", "https://fixturedownload.com/feed/json/premiership-rugby-2025"
+)
+MATCH_KEY = ["Date", "Team_A", "Team_B"]
+
+# ---------------------------------
+# Feed
+# ---------------------------------
+def prepare_results(data):
+    """Completed matches from the feed JSON, in the results CSV layout."""
+    df = pd.DataFrame(data)
+    df = df.dropna(subset=["HomeTeamScore", "AwayTeamScore"])
+    df = df[df["HomeTeamScore"] != ""]
+    df = df[df["AwayTeamScore"] != ""]
+    df = df[["HomeTeam", "AwayTeam", "HomeTeamScore", "AwayTeamScore", "DateUtc"]]
+    df = df.rename(columns={
+        "HomeTeam": "Team_A",
+        "AwayTeam": "Team_B",
+        "HomeTeamScore": "Score_A",
+        "AwayTeamScore": "Score_B",
+        "DateUtc": "Date"
+    })
+    df["Score_A"] = df["Score_A"].astype(int)
+    df["Score_B"] = df["Score_B"].astype(int)
+    df["Score_diff"] = df["Score_A"] - df["Score_B"]
+    df["Winner_flag"] = (df["Score_A"] > df["Score_B"]).astype(int)
+    df["Date"] = df["Date"].astype(str).str[:10]
+    return df[["Team_A", "Team_B", "Score_A", "Score_B", "Score_diff", "Winner_flag", "Date"]]
+
+def fetch_results(url=None):
+    response = requests.get(url or FEED_URL, timeout=30)
+    response.raise_for_status()
+    return prepare_results(response.json())
+
+def new_results(existing, fresh):
+    """(existing, new_rows): fresh matches whose MATCH_KEY is not in existing yet."""
+    if "Date" not in existing.columns:
+        # Results saved before match dates were kept: take each date from
+        # the feed row with the same teams and score
+        dates = fresh.drop_duplicates(["Team_A", "Team_B", "Score_A", "Score_B"])
+        existing = existing.merge(
+            dates[["Team_A", "Team_B", "Score_A", "Score_B", "Date"]],
+            on=["Team_A", "Team_B", "Score_A", "Score_B"], how="left"
+        )
+
+    known = pd.MultiIndex.from_frame(existing[MATCH_KEY].astype(str))
+    is_new = ~pd.MultiIndex.from_frame(fresh[MATCH_KEY].astype(str)).isin(known)
+    return existing, fresh[is_new].drop_duplicates(MATCH_KEY)
+
+def save_results(df, csv_file):
+    tmp_path = f"{csv_file}.{threading.get_ident()}.tmp"
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, csv_file)
+
+# ---------------------------------
+# Refresh
+# ---------------------------------
+def refresh_results(csv_file):
+    started = time.perf_counter()
+    existing = pd.read_csv(csv_file)
+    old_key = MODEL_STORE.artifact_key(existing)
+
+    existing, new_rows = new_results(existing, fetch_results())
+    df = pd.concat([existing, new_rows], ignore_index=True)
+    save_results(df, csv_file)
+    summary = {"added": len(new_rows), "rows": len(df), "mode": None}
+
+    key = MODEL_STORE.artifact_key(df)
+    if MODEL_STORE.status(key) != "current":
+        report = None
+        if MODEL_STORE.status(old_key) == "current":
+            bundle = warm_update(MODEL_STORE.load(old_key), df, new_rows)
+            summary["mode"] = "warm"
+        else:
+            bundle, report = train_bundle(df)
+            summary["mode"] = "full"
+        MODEL_STORE.save(key, bundle, data=data_hash(df), rows=len(df),
+                         base=old_key, mode=summary["mode"], report=report)
+
+    summary["seconds"] = round(time.perf_counter() - started, 2)
+    return summary
+
+# ---------------------------------
+# Background runner
+# ---------------------------------
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="predictor-refresh")
+_state = {"future": None, "started": None}
+_lock = threading.Lock()
+
+def start_refresh(csv_file):
+    """Start a background refresh unless one is already running."""
+    with _lock:
+        if _state["future"] is None or _state["future"].done():
+            _state["future"] = _executor.submit(refresh_results, csv_file)
+            _state["started"] = time.time()
+
+def refresh_status():
+    """{"status": idle/running/done/failed, "started", "result", "error"}."""
+    with _lock:
+        future, started = _state["future"], _state["started"]
+    if future is None:
+        return {"status": "idle", "started": None, "result": None, "error": None}
+    if not future.done():
+        return {"status": "running", "started": started, "result": None, "error": None}
+    error = future.exception()
+    if error is not None:
+        return {"status": "failed", "started": started, "result": None,
+                "error": f"{type(error).__name__}: {error}"}
+    return {"status": "done", "started": started, "result": future.result(), "error": None}
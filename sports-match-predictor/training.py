@@ -0,0 +1,200 @@
+"""
+Model training for the predictor.
+
+    python training.py                  # fit the three models in parallel
+    python training.py --search         # cross-validated hyperparameter search first
+    python training.py --search --workers 8 --csv rugby_data_report.csv
+
+train_bundle fits a fresh scaler + Decision Tree + Random Forest + linear
+model, the three models concurrently and the forest on every core. With
+search=True each model's PARAM_GRIDS candidates are cross-validated on a
+process pool first, and the best ones are fitted. It returns the bundle
+and a timing/score report, which the CLI saves to the model store.
+
+warm_update brings an existing bundle up to date with newly played
+matches without a cold retrain:
+
+    Random Forest   warm_start adds WARM_TREES trees fitted on the current
+                    data; the oldest trees are dropped above MAX_TREES
+    Linear (SGD)    partial_fit on the new matches only
+    Decision Tree   refitted, it is three levels deep and takes milliseconds
+
+The scaler is kept as it is during warm updates, since the existing trees'
+split thresholds are expressed in its units.
+"""
+import argparse
+import copy
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pandas as pd
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.linear_model import SGDClassifier
+from sklearn.model_selection import ParameterGrid, StratifiedKFold, cross_val_score, train_test_split
+from sklearn.preprocessing import StandardScaler
+from sklearn.tree import DecisionTreeClassifier
+
+from model_store import FEATURES, MODEL_STORE, data_hash
+
+TARGET = "Winner_flag"
+RANDOM_STATE = 42
+WARM_TREES = 20
+MAX_TREES = 300
+PARTIAL_FIT_PASSES = 5
+CV_FOLDS = 5
+
+PARAM_GRIDS = {
+    "dt": {"max_depth": [2, 3, 4, 6, None], "min_samples_leaf": [1, 2, 5]},
+    "rf": {"n_estimators": [100, 200], "max_depth": [None, 4, 8], "min_samples_leaf": [1, 2]},
+    "linear": {"alpha": [0.0001, 0.001, 0.01, 0.1]},
+}
+
+# ---------------------------------
+# Cold training
+# ---------------------------------
+def training_split(df, scaler):
+    X_scaled = scaler.transform(df[FEATURES])
+    return train_test_split(X_scaled, df[TARGET], test_size=0.2, random_state=RANDOM_STATE)
+
+def linear_model():
+    # Logistic loss gives probabilities like the calibrated SVC it replaces,
+    # and supports partial_fit
+    return SGDClassifier(loss="log_loss", alpha=0.01, random_state=RANDOM_STATE)
+
+def base_models(n_jobs=-1):
+    return {
+        "dt": DecisionTreeClassifier(max_depth=3, random_state=RANDOM_STATE),
+        "rf": RandomForestClassifier(n_estimators=100, random_state=RANDOM_STATE,
+                                     warm_start=True, n_jobs=n_jobs),
+        "linear": linear_model(),
+    }
+
+def _timed_fit(model, X, y):
+    start = time.perf_counter()
+    model.fit(X, y)
+    return model, time.perf_counter() - start
+
+def fit_models(models, X_train, y_train):
+    """{name: (fitted model, seconds)}, fitted concurrently; tree building releases the GIL."""
+    with ThreadPoolExecutor(max_workers=len(models)) as pool:
+        futures = {name: pool.submit(_timed_fit, model, X_train, y_train) for name, model in models.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+# ---------------------------------
+# Hyperparameter search
+# ---------------------------------
+def cv_folds(y):
+    n_splits = min(CV_FOLDS, int(y.value_counts().min()))
+    if n_splits < 2:
+        raise ValueError("Too few wins or losses in the training data for cross-validation.")
+    return StratifiedKFold(n_splits=n_splits, shuffle=True, random_state=RANDOM_STATE)
+
+def _score_candidate(name, params, X, y, folds):
+    # One core per candidate: the pool already uses every core
+    model = clone(base_models(n_jobs=1)[name]).set_params(**params)
+    return name, params, cross_val_score(model, X, y, cv=folds).mean()
+
+def search_params(X_train, y_train, workers=None):
+    """{name: (best params, mean CV accuracy)} over PARAM_GRIDS, scored on a process pool."""
+    folds = cv_folds(y_train)
+    candidates = [(name, params) for name, grid in PARAM_GRIDS.items() for params in ParameterGrid(grid)]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_score_candidate, name, params, X_train, y_train, folds)
+                   for name, params in candidates]
+        results = [future.result() for future in futures]
+
+    # Ties go to the earlier candidate, so the result does not depend on timing
+    best = {}
+    for name, params, score in results:
+        if name not in best or score > best[name][1]:
+            best[name] = (params, score)
+    return best
+
+def train_bundle(df, search=False, workers=None):
+    """(bundle, report) for df; see the module docstring."""
+    started = time.perf_counter()
+    scaler = StandardScaler().fit(df[FEATURES])
+    X_train, X_test, y_train, y_test = training_split(df, scaler)
+
+    models = base_models()
+    report = {"rows": len(df), "search": search, "models": {name: {} for name in models}}
+    if search:
+        search_started = time.perf_counter()
+        for name, (params, score) in search_params(X_train, y_train, workers).items():
+            models[name].set_params(**params)
+            report["models"][name].update(params=params, cv_accuracy=round(score, 4))
+        report["search_seconds"] = round(time.perf_counter() - search_started, 2)
+        report["candidates"] = sum(len(ParameterGrid(grid)) for grid in PARAM_GRIDS.values())
+
+    bundle = {"scaler": scaler}
+    for name, (model, seconds) in fit_models(models, X_train, y_train).items():
+        bundle[name] = model
+        report["models"][name].update(fit_seconds=round(seconds, 3),
+                                      test_accuracy=round(model.score(X_test, y_test), 4))
+
+    report["seconds"] = round(time.perf_counter() - started, 2)
+    return bundle, report
+
+# ---------------------------------
+# Warm update
+# ---------------------------------
+def warm_update(bundle, df, new_rows):
+    """Updated copy of bundle for df, which already includes new_rows. bundle is left untouched."""
+    scaler = bundle["scaler"]
+    X_train, X_test, y_train, y_test = training_split(df, scaler)
+
+    # Same hyperparameters as the served tree
+    dt_model = clone(bundle["dt"])
+    dt_model.fit(X_train, y_train)
+
+    # Shallow copy with its own tree list, so the served forest is not modified
+    rf_model = copy.copy(bundle["rf"])
+    rf_model.estimators_ = list(rf_model.estimators_)
+    rf_model.set_params(n_estimators=len(rf_model.estimators_) + WARM_TREES, warm_start=True)
+    rf_model.fit(X_train, y_train)
+    if len(rf_model.estimators_) > MAX_TREES:
+        rf_model.estimators_ = rf_model.estimators_[-MAX_TREES:]
+        rf_model.set_params(n_estimators=MAX_TREES)
+
+    linear = copy.deepcopy(bundle["linear"])
+    X_new = scaler.transform(new_rows[FEATURES])
+    for _ in range(PARTIAL_FIT_PASSES):
+        linear.partial_fit(X_new, new_rows[TARGET])
+
+    return {"dt": dt_model, "rf": rf_model, "linear": linear, "scaler": scaler}
+
+# ---------------------------------
+# Command line
+# ---------------------------------
+def report_table(report):
+    table = pd.DataFrame(report["models"]).T.rename_axis("Model")
+    if "params" in table:
+        table["params"] = table["params"].map(
+            lambda params: ", ".join(f"{name}={value}" for name, value in params.items())
+        )
+    return table
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Train the predictor's models and save the bundle.")
+    parser.add_argument("--csv", default="rugby_data_report.csv")
+    parser.add_argument("--search", action="store_true",
+                        help="cross-validate PARAM_GRIDS on a process pool and fit the best candidates")
+    parser.add_argument("--workers", type=int, help="search processes (default: one per core)")
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.csv)
+    bundle, report = train_bundle(df, search=args.search, workers=args.workers)
+
+    key = MODEL_STORE.artifact_key(df)
+    MODEL_STORE.save(key, bundle, data=data_hash(df), rows=len(df),
+                     mode="search" if args.search else "full", report=report)
+
+    print(report_table(report).to_string())
+    print(f"{report['rows']} rows, {report['seconds']}s; saved bundle {key}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""
+Team-name canonicalization shared by File_Comparison_tool and Extraction_Tool.
+
+The alias table lives in team_aliases.json next to this module (or
+$TEAM_ALIASES_FILE). It holds abbreviation rules ("St." at the start of a
+name is Saint, at the end it is State) and two alias maps from a team key
+to its canonical name:
+
+    aliases   approved by hand; applied by both tools
+    learned   proposed by the fixture comparison's fuzzy matcher; applied
+              only when comparing, until they are moved into "aliases"
+
+Both tools import this module, so a name resolves to the same key in
+either of them.
+"""
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+
+ALIASES_FILE = os.environ.get(
+    "TEAM_ALIASES_FILE",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "team_aliases.json")
+)
+
+EMPTY_TABLE = {
+    "version": 1,
+    "prefix_expansions": {},
+    "suffix_expansions": {},
+    "token_expansions": {},
+    "aliases": {},
+    "learned": {},
+}
+
+# ================= TABLE STORAGE =================
+@lru_cache(maxsize=4)
+def _load(path, mtime):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+def load_alias_table(path=ALIASES_FILE):
+    """Alias table from disk, re-read only when the file changes."""
+    if not os.path.exists(path):
+        return EMPTY_TABLE
+    return _load(path, os.path.getmtime(path))
+
+def save_alias_table(table, path=ALIASES_FILE):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(table, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp_path, path)
+
+def table_digest(table):
+    return hashlib.sha256(json.dumps(table, sort_keys=True).encode("utf-8")).hexdigest()
+
+# ================= KEYS =================
+def team_key(name, table):
+    """Lowercase, punctuation-free, abbreviation-expanded form of a team name."""
+    text = str(name).lower().replace("'", "").replace("’", "")
+    tokens = re.sub(r"[^\w&]+", " ", text).split()
+    if not tokens:
+        return ""
+
+    tokens = [table["token_expansions"].get(t, t) for t in tokens]
+    tokens[0] = table["prefix_expansions"].get(tokens[0], tokens[0])
+    if len(tokens) > 1:
+        tokens[-1] = table["suffix_expansions"].get(tokens[-1], tokens[-1])
+    return " ".join(tokens)
+
+def canonical_key(name, table):
+    key = team_key(name, table)
+    canonical = table["aliases"].get(key)
+    return team_key(canonical, table) if canonical else key
+
+def canonical_team_name(name, table):
+    """Canonical spelling of a team from the approved aliases, else the name itself."""
+    if not table:
+        return name
+    return table["aliases"].get(team_key(name, table), name)